@@ -3,6 +3,7 @@ Simple example script for using the CryptoDataFetcher
 演示如何使用加密货币数据获取工具
 """
 
+import asyncio
 import sys
 import os
 
@@ -12,37 +13,45 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from crypto_data_fetcher import CryptoDataFetcher
 
 
-def example_realtime_price():
+async def example_realtime_price():
     """Example: Get real-time cryptocurrency prices"""
+    # Imported here so examples that don't need ccxt never pay for loading it
+    import ccxt.async_support as ccxt_async
+    
     print("\n" + "="*80)
     print("示例 1: 获取实时价格")
     print("="*80)
     
-    fetcher = CryptoDataFetcher(data_source='binance')
-    
-    # Get prices for multiple cryptocurrencies
+    # Get prices for multiple cryptocurrencies concurrently
     symbols = ['BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'SOL/USDT']
     
+    exchange = ccxt_async.binance({'enableRateLimit': True})
+    try:
+        tickers = await asyncio.gather(
+            *[exchange.fetch_ticker(symbol) for symbol in symbols],
+            return_exceptions=True
+        )
+    finally:
+        await exchange.close()
+    
     print(f"\n{'交易对':<15} {'价格 (USDT)':<20}")
     print("-" * 40)
     
-    for symbol in symbols:
-        try:
-            price_data = fetcher.get_realtime_price(symbol)
-            if price_data:
-                print(f"{symbol:<15} ${price_data['price']:>15,.2f}")
-        except Exception as e:
-            print(f"{symbol:<15} Error: {e}")
+    for symbol, ticker in zip(symbols, tickers):
+        if isinstance(ticker, Exception):
+            print(f"{symbol:<15} Error: {ticker}")
+        elif ticker and ticker.get('last') is not None:
+            print(f"{symbol:<15} ${ticker['last']:>15,.2f}")
+        else:
+            print(f"{symbol:<15} Error: 无数据")
 
 
-def example_historical_klines():
+def example_historical_klines(fetcher):
     """Example: Get historical kline data"""
     print("\n" + "="*80)
     print("示例 2: 获取历史K线数据 (BTC最近30天日线)")
     print("="*80)
     
-    fetcher = CryptoDataFetcher(data_source='binance')
-    
     # Get 30 days of daily klines for BTC
     df = fetcher.get_historical_klines(
         symbol='BTC/USDT',
@@ -56,28 +65,28 @@ def example_historical_klines():
         print(f"\n最近5条数据:")
         print(df.tail())
         
-        # Calculate some statistics
+        # Calculate some statistics in one aggregation
+        stats = df.agg({'high': 'max', 'low': 'min', 'close': 'mean'})
+        close = df['close'].to_numpy()
         print(f"\n价格统计:")
-        print(f"最高价: ${df['high'].max():,.2f}")
-        print(f"最低价: ${df['low'].min():,.2f}")
-        print(f"平均价: ${df['close'].mean():,.2f}")
-        print(f"当前价: ${df['close'].iloc[-1]:,.2f}")
+        print(f"最高价: ${stats['high']:,.2f}")
+        print(f"最低价: ${stats['low']:,.2f}")
+        print(f"平均价: ${stats['close']:,.2f}")
+        print(f"当前价: ${close[-1]:,.2f}")
         
         # Calculate price change
-        price_change = ((df['close'].iloc[-1] - df['close'].iloc[0]) / df['close'].iloc[0]) * 100
+        price_change = ((close[-1] - close[0]) / close[0]) * 100
         print(f"30天涨跌幅: {price_change:+.2f}%")
     else:
         print("获取数据失败")
 
 
-def example_multiple_timeframes():
+def example_multiple_timeframes(fetcher):
     """Example: Get data for multiple timeframes"""
     print("\n" + "="*80)
     print("示例 3: 获取多个时间周期的数据")
     print("="*80)
     
-    fetcher = CryptoDataFetcher(data_source='binance')
-    
     timeframes = ['1h', '4h', '1d']
     
     print(f"\n获取 ETH/USDT 的多个时间周期数据...")
@@ -92,22 +101,19 @@ def example_multiple_timeframes():
     print("-" * 70)
     
     for tf, data in multi_data.items():
-        latest_price = data['close'].iloc[-1]
-        min_price = data['low'].min()
-        max_price = data['high'].max()
+        stats = data.agg({'low': 'min', 'high': 'max'})
+        latest_price = data['close'].iat[-1]
         
         print(f"{tf:<10} {len(data):<12} ${latest_price:>10,.2f}    "
-              f"${min_price:,.2f} - ${max_price:,.2f}")
+              f"${stats['low']:,.2f} - ${stats['high']:,.2f}")
 
 
-def example_save_to_csv():
+def example_save_to_csv(fetcher):
     """Example: Save data to CSV file"""
     print("\n" + "="*80)
     print("示例 4: 保存数据到CSV文件")
     print("="*80)
     
-    fetcher = CryptoDataFetcher(data_source='binance')
-    
     # Get hourly data for the last 7 days
     print("\n正在获取 BTC/USDT 最近7天的小时数据...")
     df = fetcher.get_historical_klines(
@@ -124,29 +130,29 @@ def example_save_to_csv():
         print("获取数据失败")
 
 
-def example_coingecko():
+def example_coingecko(fetcher):
     """Example: Using CoinGecko API"""
     print("\n" + "="*80)
     print("示例 5: 使用 CoinGecko API 获取数据")
     print("="*80)
     
     try:
-        fetcher = CryptoDataFetcher(data_source='coingecko')
-        
         coins = ['BTC', 'ETH', 'BNB', 'SOL']
         
+        # One batched /simple/price request covers every coin
+        prices = fetcher.get_realtime_prices(coins, 'USD')
+        
         print(f"\n{'币种':<10} {'价格 (USD)':<15} {'24h涨跌':<12} {'24h成交量'}")
         print("-" * 70)
         
         for coin in coins:
-            try:
-                price_data = fetcher.get_realtime_price(coin, 'USD')
-                if price_data:
-                    print(f"{coin:<10} ${price_data['price']:>11,.2f}  "
-                          f"{price_data['change_24h']:>+8.2f}%  "
-                          f"${price_data['volume_24h']:>15,.0f}")
-            except Exception as e:
-                print(f"{coin:<10} Error: {e}")
+            price_data = prices.get(coin)
+            if price_data:
+                print(f"{coin:<10} ${price_data['price']:>11,.2f}  "
+                      f"{price_data['change_24h']:>+8.2f}%  "
+                      f"${price_data['volume_24h']:>15,.0f}")
+            else:
+                print(f"{coin:<10} Error: 无数据")
     except Exception as e:
         print(f"CoinGecko API 示例失败: {e}")
         print("提示: CoinGecko 不需要安装额外库，只需要 requests 库")
@@ -160,12 +166,15 @@ def main():
     print("#" * 80)
     
     try:
-        # Run all examples
-        example_realtime_price()
-        example_historical_klines()
-        example_multiple_timeframes()
-        example_save_to_csv()
-        example_coingecko()
+        # Build each fetcher once so its HTTP connections are reused across examples
+        with CryptoDataFetcher(data_source='binance') as fetcher_binance, \
+                CryptoDataFetcher(data_source='coingecko') as fetcher_cg:
+            # Run all examples
+            asyncio.run(example_realtime_price())
+            example_historical_klines(fetcher_binance)
+            example_multiple_timeframes(fetcher_binance)
+            example_save_to_csv(fetcher_binance)
+            example_coingecko(fetcher_cg)
         
         print("\n" + "="*80)
         print("所有示例运行完成!")
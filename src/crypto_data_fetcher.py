@@ -19,55 +19,138 @@
     klines = fetcher.get_historical_klines("BTC/USDT", "1d", limit=100)
 """
 
+from __future__ import annotations
+
+import asyncio
+import json
 import logging
+import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-import pandas as pd
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+# pandas / numpy / ccxt / python-binance 导入开销大，推迟到真正用到的方法里再导入
+if TYPE_CHECKING:
+    import pandas as pd
 
 # 第三方库（安装命令：pip install ccxt requests python-binance 或 uv add ccxt python-binance requests）
-try:
-    import ccxt
-    CCXT_AVAILABLE = True
-except ImportError:
-    CCXT_AVAILABLE = False
+CCXT_AVAILABLE = find_spec('ccxt') is not None
+if not CCXT_AVAILABLE:
     print("警告：ccxt 未安装。安装命令：pip install ccxt 或 uv add ccxt")
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     print("警告：requests 未安装。安装命令：pip install requests 或 uv add requests")
 
+BINANCE_AVAILABLE = find_spec('binance') is not None
+if not BINANCE_AVAILABLE:
+    print("警告：python-binance 未安装。安装命令：pip install python-binance 或 uv add python-binance")
+
+# 可选：orjson 用 C 实现解析 JSON，比标准库快数倍；未安装时回退到 json
 try:
-    from binance.client import Client as BinanceClient
-    BINANCE_AVAILABLE = True
+    import orjson
+    _json_loads = orjson.loads
 except ImportError:
-    BINANCE_AVAILABLE = False
-    print("警告：python-binance 未安装。安装命令：pip install python-binance 或 uv add python-binance")
+    _json_loads = json.loads
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+class _TokenBucket:
+    """
+    基于单调时钟的令牌桶限速器
+    
+    以 rate 个/秒的速度补充令牌，最多积攒 capacity 个。同步 (wait) 与异步 (acquire)
+    调用共享同一个桶，并发请求会按交易所限额自动排队。
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self) -> float:
+        """尝试取走一个令牌，返回还需等待的秒数（0 表示已取到）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    async def acquire(self) -> None:
+        """异步等待直到取得一个令牌"""
+        while (delay := self._take()) > 0:
+            await asyncio.sleep(delay)
+    
+    def wait(self) -> None:
+        """同步等待直到取得一个令牌"""
+        while (delay := self._take()) > 0:
+            time.sleep(delay)
+
+
 class CryptoDataFetcher:
     """
     从多个免费数据源获取加密货币数据的主类
     """
     
-    # 支持的时间周期映射
-    TIMEFRAME_MAP = {
-        '1m': {'binance': '1m', 'ccxt': '1m', 'coingecko': 'minutely'},
-        '5m': {'binance': '5m', 'ccxt': '5m', 'coingecko': 'minutely'},
-        '15m': {'binance': '15m', 'ccxt': '15m', 'coingecko': 'minutely'},
-        '30m': {'binance': '30m', 'ccxt': '30m', 'coingecko': 'minutely'},
-        '1h': {'binance': '1h', 'ccxt': '1h', 'coingecko': 'hourly'},
-        '4h': {'binance': '4h', 'ccxt': '4h', 'coingecko': 'hourly'},
-        '1d': {'binance': '1d', 'ccxt': '1d', 'coingecko': 'daily'},
-        '1w': {'binance': '1w', 'ccxt': '1w', 'coingecko': 'daily'},
+    # 支持的时间周期映射，按数据源各一张扁平表，热路径上只需一次字典查找
+    _TF_BINANCE = {
+        '1m': '1m', '5m': '5m', '15m': '15m', '30m': '30m',
+        '1h': '1h', '4h': '4h', '1d': '1d', '1w': '1w',
+    }
+    _TF_CCXT = {
+        '1m': '1m', '5m': '5m', '15m': '15m', '30m': '30m',
+        '1h': '1h', '4h': '4h', '1d': '1d', '1w': '1w',
+    }
+    _TF_CG = {
+        '1m': 'minutely', '5m': 'minutely', '15m': 'minutely', '30m': 'minutely',
+        '1h': 'hourly', '4h': 'hourly', '1d': 'daily', '1w': 'daily',
+    }
+    
+    # 将常见符号映射到 CoinGecko ID
+    _COIN_MAP = {
+        'BTC': 'bitcoin',
+        'ETH': 'ethereum',
+        'BNB': 'binancecoin',
+        'SOL': 'solana',
+        'ADA': 'cardano',
+        'XRP': 'ripple',
+        'DOT': 'polkadot',
+        'DOGE': 'dogecoin',
+        'AVAX': 'avalanche-2',
+        'MATIC': 'matic-network',
+    }
+    
+    # K线缓存有效期（秒），周期越长数据变化越慢
+    _CACHE_TTL = {
+        '1m': 20,
+        '5m': 60,
+        '15m': 120,
+        '30m': 180,
+        '1h': 300,
+        '4h': 600,
+        '1d': 1800,
+        '1w': 3600,
     }
     
+    # 实时价格缓存有效期（秒）
+    _PRICE_CACHE_TTL = 3
+    
+    # 请求速率上限（次/秒），Binance 权重限额 1200/分钟 ≈ 20/秒
+    _RATE_LIMIT = 20
+    
     def __init__(self, data_source: str = 'binance'):
         """
         初始化数据获取器
@@ -78,19 +161,117 @@ class CryptoDataFetcher:
         self.data_source = data_source
         self.binance_client = None
         self.ccxt_exchange = None
+        self._session = None
+        self._adapter = None
+        
+        # 内存 TTL 缓存: key -> (写入时间, 数据)
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+        
+        # 每个实例一个令牌桶，串行与并发请求都经由它限速
+        self._limiter = _TokenBucket(rate=self._RATE_LIMIT, capacity=self._RATE_LIMIT)
+        
+        # CCXT 异步交易所实例在首次并发请求时创建并一直复用（市场信息只加载一次）。
+        # 它绑定在创建它的事件循环上，所以同步入口也复用同一个私有事件循环。
+        self._async_exchange = None
+        self._async_exchange_loop = None
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        
+        # 复用 HTTP 连接（keep-alive + 连接池），避免每次请求重新握手
+        if REQUESTS_AVAILABLE:
+            self._session = requests.Session()
+            self._adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=10,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+            )
+            self._session.mount('https://', self._adapter)
+        
+        # 实际取数实现，在初始化时一次性确定，避免每次调用重复判断数据源
+        self._price_impl = None
+        self._klines_impl = None
         
         # 根据可用的库初始化客户端
         if data_source == 'binance' and BINANCE_AVAILABLE:
-            self.binance_client = BinanceClient()
+            from binance.client import Client as BinanceClient
+            self.binance_client = BinanceClient(requests_params={'timeout': 10})
+            # python-binance 自带一个 requests.Session，挂上同一个连接池与重试策略
+            if self._adapter is not None:
+                self.binance_client.session.mount('https://', self._adapter)
+            self._price_impl = lambda s, v='USDT': self._get_price_binance(s)
+            self._klines_impl = self._get_klines_binance
             logging.info("已初始化 Binance 客户端")
         elif data_source == 'ccxt' and CCXT_AVAILABLE:
+            import ccxt
             self.ccxt_exchange = ccxt.binance()
+            self._price_impl = lambda s, v='USDT': self._get_price_ccxt(s)
+            self._klines_impl = lambda s, tf, n, st=None, et=None: self._get_klines_ccxt(s, tf, n, st)
             logging.info("已初始化 CCXT Binance 交易所")
         elif data_source == 'coingecko' and REQUESTS_AVAILABLE:
+            self._price_impl = lambda s, v='usd': self._get_price_coingecko(s.split('/')[0], v.lower())
+            self._klines_impl = lambda s, tf, n, st=None, et=None: self._get_klines_coingecko(s.split('/')[0], n)
             logging.info("使用 CoinGecko API")
         else:
             logging.warning(f"数据源 '{data_source}' 不可用。请检查依赖。")
     
+    def close(self) -> None:
+        """关闭 CCXT 异步交易所、私有事件循环和底层 HTTP 会话，释放连接池"""
+        loop = self._async_exchange_loop
+        if self._async_exchange is not None and loop is not None and not loop.is_closed():
+            if loop.is_running():
+                logging.warning("CCXT 异步交易所所在的事件循环仍在运行，请在其中调用 await fetcher.aclose()")
+            else:
+                loop.run_until_complete(self._close_async_exchange())
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+        if self._session is not None:
+            self._session.close()
+    
+    async def aclose(self) -> None:
+        """在异步代码中关闭获取器：先关闭 CCXT 异步交易所，再释放其余资源"""
+        await self._close_async_exchange()
+        self.close()
+    
+    def __enter__(self) -> 'CryptoDataFetcher':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def _cache_get(self, key: tuple, ttl: float) -> Any:
+        """读取未过期的缓存项，未命中返回 None"""
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        return None
+    
+    def _cache_put(self, key: tuple, value: Any) -> None:
+        """写入缓存项"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), value)
+    
+    @staticmethod
+    def _map_timeframe(table: Dict[str, str], timeframe: str) -> str:
+        """把通用时间周期转换为数据源的写法，不支持时抛出 ValueError"""
+        try:
+            return table[timeframe]
+        except KeyError:
+            raise ValueError(f"不支持的时间周期: {timeframe}，可选: {', '.join(table)}") from None
+    
+    def _klines_cache_key(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> tuple:
+        """K线缓存的键"""
+        return ('klines', self.data_source, symbol, timeframe, limit, start_time, end_time)
+    
     def get_realtime_price(self, symbol: str, vs_currency: str = 'USDT') -> Optional[Dict[str, Any]]:
         """
         获取加密货币的实时价格
@@ -105,19 +286,25 @@ class CryptoDataFetcher:
             - CCXT: {'symbol', 'price', 'bid', 'ask', 'high_24h', 'low_24h', 'volume_24h', 'timestamp', 'source'}
             - CoinGecko: {'symbol', 'price', 'change_24h', 'volume_24h', 'last_updated', 'source'}
         """
+        key = ('price', self.data_source, symbol, vs_currency)
+        cached = self._cache_get(key, self._PRICE_CACHE_TTL)
+        if cached is not None:
+            return dict(cached)
+        
+        if self._price_impl is None:
+            logging.error("没有可用的数据源")
+            return None
+        
         try:
-            if self.data_source == 'binance' and self.binance_client:
-                return self._get_price_binance(symbol)
-            elif self.data_source == 'ccxt' and self.ccxt_exchange:
-                return self._get_price_ccxt(symbol)
-            elif self.data_source == 'coingecko':
-                return self._get_price_coingecko(symbol.split('/')[0], vs_currency.lower())
-            else:
-                logging.error("没有可用的数据源")
-                return None
+            price = self._price_impl(symbol, vs_currency)
         except Exception as e:
             logging.error(f"获取实时价格时出错: {e}")
             return None
+        
+        if price is not None:
+            self._cache_put(key, price)
+            return dict(price)
+        return None
     
     def _get_price_binance(self, symbol: str) -> Optional[Dict[str, Any]]:
         """从 Binance API 获取价格"""
@@ -153,21 +340,7 @@ class CryptoDataFetcher:
     
     def _get_price_coingecko(self, coin_id: str, vs_currency: str = 'usd') -> Optional[Dict[str, Any]]:
         """从 CoinGecko API 获取价格"""
-        # 将常见符号映射到 CoinGecko ID
-        coin_map = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'SOL': 'solana',
-            'ADA': 'cardano',
-            'XRP': 'ripple',
-            'DOT': 'polkadot',
-            'DOGE': 'dogecoin',
-            'AVAX': 'avalanche-2',
-            'MATIC': 'matic-network',
-        }
-        
-        coin_id_mapped = coin_map.get(coin_id.upper(), coin_id.lower())
+        coin_id_mapped = self._COIN_MAP.get(coin_id.upper(), coin_id.lower())
         
         url = f"https://api.coingecko.com/api/v3/simple/price"
         params = {
@@ -178,28 +351,88 @@ class CryptoDataFetcher:
             'include_last_updated_at': 'true'
         }
         
-        response = requests.get(url, params=params)
-        data = response.json()
+        response = self._session.get(url, params=params, timeout=10)
+        data = _json_loads(response.content)
         
         if coin_id_mapped in data:
-            coin_data = data[coin_id_mapped]
-            return {
-                'symbol': f"{coin_id}/{vs_currency.upper()}",
-                'price': coin_data[vs_currency],
-                'change_24h': coin_data.get(f'{vs_currency}_24h_change', 0),
-                'volume_24h': coin_data.get(f'{vs_currency}_24h_vol', 0),
-                'last_updated': coin_data.get('last_updated_at', 0),
-                'source': 'coingecko'
-            }
+            return self._format_coingecko_price(coin_id, vs_currency, data[coin_id_mapped])
         return None
     
+    @staticmethod
+    def _format_coingecko_price(coin_id: str, vs_currency: str, coin_data: Dict[str, Any]) -> Dict[str, Any]:
+        """将 CoinGecko /simple/price 的单个币种结果转换为统一格式"""
+        return {
+            'symbol': f"{coin_id}/{vs_currency.upper()}",
+            'price': coin_data[vs_currency],
+            'change_24h': coin_data.get(f'{vs_currency}_24h_change', 0),
+            'volume_24h': coin_data.get(f'{vs_currency}_24h_vol', 0),
+            'last_updated': coin_data.get('last_updated_at', 0),
+            'source': 'coingecko'
+        }
+    
+    def get_realtime_prices(self, symbols: List[str], vs_currency: str = 'USDT') -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取多个加密货币的实时价格
+        
+        CoinGecko 数据源只发送一次 /simple/price 请求（ids 以逗号分隔）；
+        其他数据源逐个调用 get_realtime_price。
+        
+        参数:
+            symbols: 交易对或币种符号列表 (例如: ['BTC/USDT', 'ETH/USDT'] 或 ['BTC', 'ETH'])
+            vs_currency: 计价货币 (默认: 'USDT')
+            
+        返回:
+            一个字典，键是传入的符号，值与 get_realtime_price 返回的结构相同。
+            获取失败的符号不会出现在结果中。
+        """
+        if self.data_source != 'coingecko':
+            results = {}
+            for symbol in symbols:
+                price_data = self.get_realtime_price(symbol, vs_currency)
+                if price_data:
+                    results[symbol] = price_data
+            return results
+        
+        vs = vs_currency.lower()
+        coin_ids = {
+            symbol: self._COIN_MAP.get(symbol.split('/')[0].upper(), symbol.split('/')[0].lower())
+            for symbol in symbols
+        }
+        
+        url = "https://api.coingecko.com/api/v3/simple/price"
+        params = {
+            'ids': ','.join(dict.fromkeys(coin_ids.values())),
+            'vs_currencies': vs,
+            'include_24hr_change': 'true',
+            'include_24hr_vol': 'true',
+            'include_last_updated_at': 'true'
+        }
+        
+        try:
+            response = self._session.get(url, params=params, timeout=10)
+            data = _json_loads(response.content)
+        except Exception as e:
+            logging.error(f"批量获取实时价格时出错: {e}")
+            return {}
+        
+        results = {}
+        for symbol, coin_id_mapped in coin_ids.items():
+            coin_data = data.get(coin_id_mapped)
+            if coin_data and vs in coin_data:
+                results[symbol] = self._format_coingecko_price(symbol.split('/')[0], vs, coin_data)
+            else:
+                logging.warning(f"CoinGecko 未返回 {symbol} 的价格")
+        
+        return results
+    
     def get_historical_klines(
         self, 
         symbol: str, 
         timeframe: str = '1d', 
         limit: int = 100,
         start_time: Optional[int] = None,
-        end_time: Optional[int] = None
+        end_time: Optional[int] = None,
+        parse_dates: bool = True
     ) -> Optional[pd.DataFrame]:
         """
         获取历史K线/蜡烛图数据
@@ -210,30 +443,52 @@ class CryptoDataFetcher:
             limit: 获取K线数量 (默认: 100, 最大: 1000)
             start_time: 开始时间戳（毫秒）（可选）
             end_time: 结束时间戳（毫秒）（可选）
+            parse_dates: 是否将 timestamp 转换为 datetime (默认: True)。
+                只做 min/max/比较等运算时传 False，保留 int64 毫秒时间戳可省去转换开销
             
         返回:
             包含K线数据的 pandas.DataFrame，失败则返回 None。
             DataFrame 包含以下列:
-            - timestamp (datetime): K线开盘时间
+            - timestamp (datetime 或 int64): K线开盘时间
             - open (float): 开盘价
             - high (float): 最高价
             - low (float): 最低价
             - close (float): 收盘价
             - volume (float): 成交量
         """
+        key = self._klines_cache_key(symbol, timeframe, limit, start_time, end_time)
+        cached = self._cache_get(key, self._CACHE_TTL.get(timeframe, 0))
+        if cached is not None:
+            return self._finalize_klines(cached, parse_dates)
+        
+        if self._klines_impl is None:
+            logging.error("没有可用的数据源")
+            return None
+        
         try:
-            if self.data_source == 'binance' and self.binance_client:
-                return self._get_klines_binance(symbol, timeframe, limit, start_time, end_time)
-            elif self.data_source == 'ccxt' and self.ccxt_exchange:
-                return self._get_klines_ccxt(symbol, timeframe, limit, start_time)
-            elif self.data_source == 'coingecko':
-                return self._get_klines_coingecko(symbol.split('/')[0], limit)
-            else:
-                logging.error("没有可用的数据源")
-                return None
+            df = self._klines_impl(symbol, timeframe, limit, start_time, end_time)
         except Exception as e:
             logging.error(f"获取历史K线数据时出错: {e}")
             return None
+        
+        if df is not None and not df.empty:
+            self._cache_put(key, df)
+            return self._finalize_klines(df, parse_dates)
+        return df
+    
+    @staticmethod
+    def _finalize_klines(df: pd.DataFrame, parse_dates: bool) -> pd.DataFrame:
+        """
+        复制缓存中的原始K线数据，并按需把 int64 毫秒时间戳转换为 datetime
+        
+        各数据源实现与缓存中都保留 int64 时间戳，转换只在这里做一次。
+        """
+        import pandas as pd
+        
+        df = df.copy()
+        if parse_dates:
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
     
     def _get_klines_binance(
         self, 
@@ -244,8 +499,11 @@ class CryptoDataFetcher:
         end_time: Optional[int]
     ) -> pd.DataFrame:
         """从 Binance API 获取K线数据"""
+        import numpy as np
+        import pandas as pd
+        
         symbol_formatted = symbol.replace('/', '')
-        interval = self.TIMEFRAME_MAP[timeframe]['binance']
+        interval = self._map_timeframe(self._TF_BINANCE, timeframe)
         
         # 构建参数
         kwargs = {
@@ -261,17 +519,14 @@ class CryptoDataFetcher:
         
         klines = self.binance_client.get_klines(**kwargs)
         
-        # 转换为 DataFrame
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
+        if not klines:
+            return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
         
-        # 只保留必要的列并转换类型
-        df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df[['open', 'high', 'low', 'close', 'volume']] = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
+        # 先裁剪到前 6 列，再一次性解析为 float64（毫秒时间戳在 float64 中可精确表示）
+        arr = np.array([row[:6] for row in klines], dtype=np.float64)
+        
+        df = pd.DataFrame(arr[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'])
+        df.insert(0, 'timestamp', arr[:, 0].astype(np.int64))
         
         return df
     
@@ -283,7 +538,7 @@ class CryptoDataFetcher:
         start_time: Optional[int]
     ) -> pd.DataFrame:
         """从 CCXT 获取K线数据"""
-        timeframe_ccxt = self.TIMEFRAME_MAP[timeframe]['ccxt']
+        timeframe_ccxt = self._map_timeframe(self._TF_CCXT, timeframe)
         
         # 获取 OHLCV 数据
         ohlcv = self.ccxt_exchange.fetch_ohlcv(
@@ -293,29 +548,21 @@ class CryptoDataFetcher:
             limit=limit
         )
         
-        # 转换为 DataFrame
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return self._ohlcv_to_dataframe(ohlcv)
+    
+    @staticmethod
+    def _ohlcv_to_dataframe(ohlcv: List[List[Any]]) -> pd.DataFrame:
+        """将 CCXT 返回的 OHLCV 列表转换为 DataFrame（timestamp 保留为 int64 毫秒）"""
+        import pandas as pd
         
-        return df
+        return pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
     
     def _get_klines_coingecko(self, coin_id: str, days: int) -> pd.DataFrame:
         """从 CoinGecko API 获取历史数据"""
-        # 将常见符号映射到 CoinGecko ID
-        coin_map = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'SOL': 'solana',
-            'ADA': 'cardano',
-            'XRP': 'ripple',
-            'DOT': 'polkadot',
-            'DOGE': 'dogecoin',
-            'AVAX': 'avalanche-2',
-            'MATIC': 'matic-network',
-        }
+        import numpy as np
+        import pandas as pd
         
-        coin_id_mapped = coin_map.get(coin_id.upper(), coin_id.lower())
+        coin_id_mapped = self._COIN_MAP.get(coin_id.upper(), coin_id.lower())
         
         url = f"https://api.coingecko.com/api/v3/coins/{coin_id_mapped}/market_chart"
         params = {
@@ -324,20 +571,22 @@ class CryptoDataFetcher:
             'interval': 'daily' if days > 90 else 'hourly'
         }
         
-        response = requests.get(url, params=params)
-        data = response.json()
+        response = self._session.get(url, params=params, timeout=10)
+        data = _json_loads(response.content)
         
         if 'prices' in data:
-            df = pd.DataFrame(data['prices'], columns=['timestamp', 'close'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            prices = np.asarray(data['prices'], dtype=np.float64).reshape(-1, 2)
+            close = prices[:, 1]
             
             # CoinGecko 的免费层级不提供 OHLC 数据，只有收盘价
-            df['open'] = df['close']
-            df['high'] = df['close']
-            df['low'] = df['close']
-            df['volume'] = 0  # 简单端点中不可用
-            
-            return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+            return pd.DataFrame({
+                'timestamp': prices[:, 0].astype(np.int64),
+                'open': close,
+                'high': close,
+                'low': close,
+                'close': close,
+                'volume': 0.0,  # 简单端点中不可用
+            })
         
         return pd.DataFrame()
     
@@ -345,33 +594,144 @@ class CryptoDataFetcher:
         self, 
         symbol: str, 
         timeframes: List[str], 
-        limit: int = 100
+        limit: int = 100,
+        parse_dates: bool = True
     ) -> Dict[str, pd.DataFrame]:
         """
         一次性获取多个时间周期的历史K线数据
         
+        Binance / CCXT 数据源会通过 get_multiple_timeframes_async 并发请求所有周期；
+        如果当前线程已有运行中的事件循环，请直接 await 异步版本。
+        
         参数:
             symbol: 交易对符号
             timeframes: 要获取的时间周期列表
             limit: 每个时间周期的K线数量
+            parse_dates: 是否将 timestamp 转换为 datetime（同 get_historical_klines）
             
         返回:
             一个字典，键是时间周期 (str)，值是包含K线数据的 pandas.DataFrame。
             每个 DataFrame 的结构与 get_historical_klines 返回的相同。
         """
-        results = {}
+        if CCXT_AVAILABLE and self.data_source in ('binance', 'ccxt'):
+            with self._loop_lock:
+                if self._loop is None:
+                    self._loop = asyncio.new_event_loop()
+                return self._loop.run_until_complete(
+                    self.get_multiple_timeframes_async(symbol, timeframes, limit, parse_dates)
+                )
         
+        logging.info(f"正在获取 {symbol} 的 {', '.join(timeframes)} 周期数据...")
+        results = {}
         for tf in timeframes:
-            logging.info(f"正在获取 {symbol} 的 {tf} 周期数据...")
-            df = self.get_historical_klines(symbol, tf, limit)
-            if df is not None and not df.empty:
+            self._limiter.wait()
+            df = self.get_historical_klines(symbol, tf, limit, parse_dates=parse_dates)
+            if df is not None and len(df):
                 results[tf] = df
-                time.sleep(0.1)  # 小延迟以避免速率限制
-            else:
-                logging.warning(f"获取 {tf} 周期数据失败")
         
+        failed = [tf for tf in timeframes if tf not in results]
+        if failed:
+            logging.warning(f"获取 {', '.join(failed)} 周期数据失败")
         return results
     
+    async def get_multiple_timeframes_async(
+        self, 
+        symbol: str, 
+        timeframes: List[str], 
+        limit: int = 100,
+        parse_dates: bool = True
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        并发获取多个时间周期的历史K线数据（基于 ccxt.async_support）
+        
+        所有周期的请求同时发出，总耗时约等于单次请求的往返时间。
+        每个请求发出前先从实例的令牌桶取令牌，按交易所限额自动限速。
+        交易所实例在多次调用间复用，使用完毕后请 await fetcher.aclose()。
+        
+        参数:
+            symbol: 交易对符号 (例如: 'BTC/USDT')
+            timeframes: 要获取的时间周期列表
+            limit: 每个时间周期的K线数量
+            parse_dates: 是否将 timestamp 转换为 datetime（同 get_historical_klines）
+            
+        返回:
+            与 get_multiple_timeframes 相同结构的字典
+        """
+        if not CCXT_AVAILABLE:
+            raise RuntimeError("ccxt 未安装，无法使用异步获取。安装命令：pip install ccxt 或 uv add ccxt")
+        
+        results = {}
+        missing = []
+        for tf in timeframes:
+            if tf not in self._TF_CCXT:
+                logging.warning(f"不支持的时间周期: {tf}，可选: {', '.join(self._TF_CCXT)}")
+                continue
+            cached = self._cache_get(self._klines_cache_key(symbol, tf, limit), self._CACHE_TTL[tf])
+            if cached is not None:
+                results[tf] = self._finalize_klines(cached, parse_dates)
+            else:
+                missing.append(tf)
+        
+        if not missing:
+            return results
+        
+        exchange = await self._get_async_exchange()
+        
+        async def fetch(tf: str) -> List[List[Any]]:
+            await self._limiter.acquire()
+            return await exchange.fetch_ohlcv(symbol, self._TF_CCXT[tf], limit=limit)
+        
+        responses = await asyncio.gather(
+            *[fetch(tf) for tf in missing],
+            return_exceptions=True
+        )
+        
+        fetched = {
+            tf: self._ohlcv_to_dataframe(ohlcv)
+            for tf, ohlcv in zip(missing, responses)
+            if not isinstance(ohlcv, Exception) and len(ohlcv)
+        }
+        for tf, df in fetched.items():
+            self._cache_put(self._klines_cache_key(symbol, tf, limit), df)
+            results[tf] = self._finalize_klines(df, parse_dates)
+        
+        logging.info(f"已并发获取 {symbol} 的 {len(fetched)}/{len(missing)} 个周期数据: {', '.join(fetched)}")
+        failed = [
+            f"{tf} ({ohlcv})" if isinstance(ohlcv, Exception) else tf
+            for tf, ohlcv in zip(missing, responses)
+            if tf not in fetched
+        ]
+        if failed:
+            logging.warning(f"获取以下周期数据失败: {'; '.join(failed)}")
+        
+        # 按传入的周期顺序返回（缓存命中的周期不会打乱顺序）
+        return {tf: results[tf] for tf in timeframes if tf in results}
+    
+    async def _get_async_exchange(self):
+        """
+        返回当前事件循环上的 CCXT 异步交易所实例，首次调用时创建
+        
+        实例绑定在创建它的事件循环上；在另一个事件循环中调用时关闭旧实例并重建。
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_exchange is not None and self._async_exchange_loop is not loop:
+            await self._close_async_exchange()
+        if self._async_exchange is None:
+            import ccxt.async_support as ccxt_async
+            # 限速由 self._limiter 统一负责，关闭 CCXT 自带的串行节流
+            self._async_exchange = ccxt_async.binance({'enableRateLimit': False})
+            self._async_exchange_loop = loop
+        return self._async_exchange
+    
+    async def _close_async_exchange(self) -> None:
+        """关闭并丢弃 CCXT 异步交易所实例"""
+        exchange, self._async_exchange, self._async_exchange_loop = self._async_exchange, None, None
+        if exchange is not None:
+            try:
+                await exchange.close()
+            except Exception as e:
+                logging.warning(f"关闭 CCXT 异步交易所时出错: {e}")
+    
     def save_to_csv(self, df: pd.DataFrame, filename: str) -> None:
         """
         将 DataFrame 保存到 CSV 文件
@@ -383,6 +743,91 @@ class CryptoDataFetcher:
         df.to_csv(filename, index=False)
         logging.info(f"数据已保存到 {filename}")
     
+    def save_to_csv_append(self, df: pd.DataFrame, filename: str) -> int:
+        """
+        以追加模式把K线数据写入 CSV 文件
+        
+        只写入时间戳晚于文件最后一行的记录，每次保存的 I/O 与新增行数成正比，
+        适合长期运行、周期性保存的场景。文件不存在时会新建并写入表头。
+        
+        参数:
+            df: 要保存的 DataFrame（需包含 timestamp 列）
+            filename: 输出文件名
+            
+        返回:
+            实际追加的行数；列与已有文件不一致时不写入并返回 0
+        """
+        import pandas as pd
+        
+        if df is None or df.empty:
+            return 0
+        
+        if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+            df.to_csv(filename, index=False)
+            logging.info(f"数据已保存到 {filename}")
+            return len(df)
+        
+        header, last_line = self._read_csv_edges(filename)
+        if header != list(df.columns):
+            logging.error(f"{filename} 的列 {header} 与数据的列 {list(df.columns)} 不一致，已跳过追加")
+            return 0
+        
+        new_rows = df
+        if last_line is not None:
+            last_value = last_line.split(',')[header.index('timestamp')]
+            ts = df['timestamp']
+            if pd.api.types.is_datetime64_any_dtype(ts):
+                new_rows = df[ts > pd.Timestamp(last_value)]
+            else:
+                new_rows = df[ts > int(float(last_value))]
+        
+        if not new_rows.empty:
+            new_rows.to_csv(filename, mode='a', header=False, index=False)
+        logging.info(f"已向 {filename} 追加 {len(new_rows)} 条记录")
+        return len(new_rows)
+    
+    @staticmethod
+    def _read_csv_edges(filename: str, block_size: int = 4096) -> tuple:
+        """
+        读取 CSV 文件的表头和最后一行数据
+        
+        最后一行从文件末尾按块回读，不需要扫描整个文件。
+        只有表头没有数据时，最后一行返回 None。
+        """
+        with open(filename, 'rb') as f:
+            first = f.readline()
+            header = first.decode('utf-8').rstrip('\r\n').split(',')
+            
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            tail = b''
+            while pos > 0:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+                if tail.rstrip(b'\r\n').count(b'\n') >= 1:
+                    break
+        
+        lines = tail.rstrip(b'\r\n').splitlines()
+        if pos == 0 and len(lines) <= 1:
+            return header, None
+        return header, lines[-1].decode('utf-8')
+    
+    def save_to_parquet(self, df: pd.DataFrame, filename: str) -> None:
+        """
+        将 DataFrame 保存到 Parquet 文件（zstd 压缩）
+        
+        列式二进制格式，写入速度和文件体积都明显优于 CSV。
+        需要安装 pyarrow：pip install pyarrow 或 uv add pyarrow
+        
+        参数:
+            df: 要保存的 DataFrame
+            filename: 输出文件名
+        """
+        df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
+        logging.info(f"数据已保存到 {filename}")
+    
     def print_summary(self, df: pd.DataFrame) -> None:
         """
         打印K线数据的摘要信息
@@ -390,6 +835,8 @@ class CryptoDataFetcher:
         参数:
             df: 包含K线数据的 DataFrame
         """
+        import pandas as pd
+        
         if df is None or df.empty:
             print("没有数据可显示")
             return
@@ -398,7 +845,10 @@ class CryptoDataFetcher:
         print(f"数据摘要")
         print("="*80)
         print(f"总记录数: {len(df)}")
-        print(f"时间范围: {df['timestamp'].min()} 到 {df['timestamp'].max()}")
+        ts = df['timestamp']
+        if pd.api.types.is_integer_dtype(ts):
+            ts = pd.to_datetime(ts, unit='ms')
+        print(f"时间范围: {ts.min()} 到 {ts.max()}")
         print(f"\n前 5 条记录:")
         print(df.head())
         print(f"\n后 5 条记录:")
@@ -447,10 +897,11 @@ def demo_usage():
     multi_data = fetcher.get_multiple_timeframes('BTC/USDT', timeframes, limit=20)
     
     for tf, data in multi_data.items():
+        stats = data.agg({'low': 'min', 'high': 'max'})
         print(f"\n时间周期: {tf}")
         print(f"记录数: {len(data)}")
-        print(f"最新价格: ${data['close'].iloc[-1]:,.2f}")
-        print(f"价格区间: ${data['low'].min():,.2f} - ${data['high'].max():,.2f}")
+        print(f"最新价格: ${data['close'].iat[-1]:,.2f}")
+        print(f"价格区间: ${stats['low']:,.2f} - ${stats['high']:,.2f}")
     
     # 示例 4: 使用 CoinGecko
     print("\n" + "=" * 80)
@@ -6,15 +6,24 @@ Pionex Automated Dip Hunter Strategy.
 它监控BTC和ETH的价格，在大幅下跌时买入，并设置止盈订单。
 """
 import os
+import json
 import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
 # 假设已安装pionex-python-sdk
 # pip install pionex-python-sdk
 from pionex import Pionex
 
+# websockets 随 python-binance 一起安装；缺失时回退到轮询模式
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
 # --- 配置日志 ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -28,7 +37,12 @@ TARGETS = {
 BUY_AMOUNT_USDT = 2500.0  # 每次买入的金额 (USDT)
 TAKE_PROFIT_PERCENTAGE = 1.15 # 止盈点 (+15%)
 COOLDOWN_PERIOD_SECONDS = 24 * 60 * 60  # 冷却时间 (24小时)
-LOOP_SLEEP_SECONDS = 5 * 60 # 循环间隔 (5分钟)
+LOOP_SLEEP_SECONDS = 5 * 60 # 轮询间隔；推送模式下作为心跳/重连超时 (5分钟)
+RECONNECT_DELAY_SECONDS = 5 # 推送连接断开后的重连等待
+BUY_RETRY_BACKOFF_SECONDS = LOOP_SLEEP_SECONDS # 买单失败后再次尝试前的等待，与轮询间隔一致
+
+# Binance 24小时行情推送 (组合流)，用于实时检测下跌
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/stream"
 
 
 def get_pionex_client() -> Optional[Pionex]:
@@ -79,6 +93,27 @@ def get_market_data(client: Pionex, symbol: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def get_market_data_batch(client: Pionex, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    一次请求获取多个交易对的24小时行情数据。
+
+    Args:
+        client: Pionex客户端对象。
+        symbols: 交易对列表 (例如, ['BTC_USDT', 'ETH_USDT'])。
+
+    Returns:
+        以交易对为键的行情字典。失败时返回空字典。
+    """
+    try:
+        tickers = client.market.tickers(symbols=symbols)
+        if tickers and 'tickers' in tickers:
+            return {ticker['symbol']: ticker for ticker in tickers['tickers'] if 'symbol' in ticker}
+        return {}
+    except Exception as e:
+        logging.error(f"批量获取行情数据时出错: {e}")
+        return {}
+
+
 def place_buy_order(client: Pionex, symbol: str, amount_usdt: float) -> Optional[Dict[str, Any]]:
     """
     下一个现货市价买单。
@@ -134,86 +169,214 @@ def place_sell_order(client: Pionex, symbol: str, quantity: str, price: str) ->
         return None
 
 
-def run_strategy() -> None:
+def is_in_cooldown(symbol: str, last_buy_times: Dict[str, float], now: float) -> bool:
+    """检查交易对是否仍处于上次买入后的冷却期。"""
+    return symbol in last_buy_times and now - last_buy_times[symbol] < COOLDOWN_PERIOD_SECONDS
+
+
+async def execute_dip_buy(client: Pionex, symbol: str, last_buy_times: Dict[str, float]) -> None:
     """
-    运行“下跌猎手”策略循环的主函数。
+    执行一次抄底：市价买入，并根据成交均价挂止盈单。
+
+    阻塞的 SDK 调用在线程池中执行，等待成交期间不会阻塞其他交易对。
+    下单前先记录一次尝试：无论下单结果如何（包括余额不足、API 报错），该交易对在
+    BUY_RETRY_BACKOFF_SECONDS 内都不会被再次触发，下单期间到达的推送也会被跳过；
+    买单被接受后再记录完整的冷却时间。
+
+    Args:
+        client: Pionex客户端对象。
+        symbol: 交易对 (例如, 'BTC_USDT')。
+        last_buy_times: 每个交易对上次买入的时间戳，会被原地更新。
     """
-    logging.info("启动“下跌猎手”策略...")
-    client = get_pionex_client()
-    if not client:
-        logging.critical("客户端初始化失败，策略退出。")
+    # 4. 执行买入（先记录尝试，使 is_in_cooldown 在 BUY_RETRY_BACKOFF_SECONDS 内成立）
+    last_buy_times[symbol] = time.time() - COOLDOWN_PERIOD_SECONDS + BUY_RETRY_BACKOFF_SECONDS
+    buy_order = await asyncio.to_thread(place_buy_order, client, symbol, BUY_AMOUNT_USDT)
+
+    if not buy_order or not buy_order.get('orderId'):
+        logging.error(f"为 {symbol} 下买单失败或未返回订单ID，{BUY_RETRY_BACKOFF_SECONDS / 60} 分钟后再尝试。")
         return
 
-    # 用于跟踪每个币种的上次购买时间，以实现冷却机制
-    last_buy_times: Dict[str, float] = {}
+    # 5. 更新购买时间戳
+    last_buy_times[symbol] = time.time()
+
+    # 6. 买入成功后，下止盈单
+    # 我们需要获取买入的实际成交数量和均价来计算卖出参数
+    # 为简化草稿，我们假设立即成交并能获取信息
+    # 注意：真实的成交可能需要轮询订单状态
+    await asyncio.sleep(2) # 等待订单成交
+    try:
+        order_details = await asyncio.to_thread(
+            client.trade.get_order, symbol=symbol, order_id=buy_order['orderId']
+        )
+        filled_quantity = order_details.get('executedQuantity')
+        avg_price_str = order_details.get('avgPrice')
+
+        if filled_quantity and avg_price_str:
+            avg_price = float(avg_price_str)
+            take_profit_price = avg_price * TAKE_PROFIT_PERCENTAGE
 
+            # 格式化以满足API精度要求 (需要查询具体交易对的精度规则)
+            # 此处为草稿简化
+            price_str = f"{take_profit_price:.2f}"
+
+            await asyncio.to_thread(place_sell_order, client, symbol, filled_quantity, price_str)
+        else:
+            logging.error(f"无法获取买单 {buy_order['orderId']} 的成交详情。")
+
+    except Exception as e:
+        logging.error(f"处理买单后续操作时出错: {e}")
+
+
+async def check_symbol(
+    client: Pionex,
+    symbol: str,
+    params: Dict[str, Any],
+    last_buy_times: Dict[str, float],
+    market_data: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    轮询模式下检查单个交易对：获取行情，满足条件时执行抄底。
+
+    Args:
+        client: Pionex客户端对象。
+        symbol: 交易对 (例如, 'BTC_USDT')。
+        params: 该交易对在 TARGETS 中的参数。
+        last_buy_times: 每个交易对上次买入的时间戳。
+        market_data: 批量请求中已获取的行情；缺失时单独请求该交易对。
+    """
+    dip_percentage_trigger = params['dip_percentage']
+
+    # 1. 检查冷却时间
+    if is_in_cooldown(symbol, last_buy_times, time.time()):
+        logging.info(f"{symbol} 处于冷却期，跳过。")
+        return
+
+    # 2. 获取行情数据
+    if market_data is None:
+        market_data = await asyncio.to_thread(get_market_data, client, symbol)
+    if not market_data:
+        return
+
+    # 派网API返回的涨跌幅是'change24h'字段，且是字符串形式，例如 "0.05" 代表 +5%
+    change_24h_str = market_data.get('change24h', "0.0")
+    try:
+        change_24h = float(change_24h_str) * 100
+    except ValueError:
+        logging.warning(f"无法解析 {symbol} 的24小时变动数据: '{change_24h_str}'")
+        return
+
+    logging.info(f"{symbol} 当前24小时变动: {change_24h:.2f}% (触发条件: < {dip_percentage_trigger}%)")
+
+    # 3. 检查是否满足触发条件
+    if change_24h < dip_percentage_trigger:
+        logging.warning(f"!!! 触发 {symbol} 的买入条件 !!!")
+        await execute_dip_buy(client, symbol, last_buy_times)
+
+
+async def poll_strategy(client: Pionex, last_buy_times: Dict[str, float]) -> None:
+    """
+    轮询模式：每隔 LOOP_SLEEP_SECONDS 并发检查所有交易对。
+
+    Args:
+        client: Pionex客户端对象。
+        last_buy_times: 每个交易对上次买入的时间戳。
+    """
     while True:
         logging.info("开始新一轮策略检查...")
-        for symbol, params in TARGETS.items():
-            dip_percentage_trigger = params['dip_percentage']
-
-            # 1. 检查冷却时间
-            current_time = time.time()
-            if symbol in last_buy_times and current_time - last_buy_times[symbol] < COOLDOWN_PERIOD_SECONDS:
-                logging.info(f"{symbol} 处于冷却期，跳过。")
-                continue
-
-            # 2. 获取行情数据
-            market_data = get_market_data(client, symbol)
-            if not market_data:
-                continue
-            
-            # 派网API返回的涨跌幅是'change24h'字段，且是字符串形式，例如 "0.05" 代表 +5%
-            change_24h_str = market_data.get('change24h', "0.0")
-            try:
-                change_24h = float(change_24h_str) * 100
-            except ValueError:
-                logging.warning(f"无法解析 {symbol} 的24小时变动数据: '{change_24h_str}'")
-                continue
-
-            logging.info(f"{symbol} 当前24小时变动: {change_24h:.2f}% (触发条件: < {dip_percentage_trigger}%)")
-
-            # 3. 检查是否满足触发条件
-            if change_24h < dip_percentage_trigger:
-                logging.warning(f"!!! 触发 {symbol} 的买入条件 !!!")
-                
-                # 4. 执行买入
-                buy_order = place_buy_order(client, symbol, BUY_AMOUNT_USDT)
-                
-                if buy_order and buy_order.get('orderId'):
-                    # 5. 买入成功后，下止盈单
-                    # 我们需要获取买入的实际成交数量和均价来计算卖出参数
-                    # 为简化草稿，我们假设立即成交并能获取信息
-                    # 注意：真实的成交可能需要轮询订单状态
-                    time.sleep(2) # 等待订单成交
-                    try:
-                        order_details = client.trade.get_order(symbol=symbol, order_id=buy_order['orderId'])
-                        filled_quantity = order_details.get('executedQuantity')
-                        avg_price_str = order_details.get('avgPrice')
+        # 一次请求获取全部交易对的行情，再在本地按交易对分发
+        ticker_by_symbol = await asyncio.to_thread(get_market_data_batch, client, list(TARGETS.keys()))
+        await asyncio.gather(
+            *(
+                check_symbol(client, symbol, params, last_buy_times, ticker_by_symbol.get(symbol))
+                for symbol, params in TARGETS.items()
+            )
+        )
 
-                        if filled_quantity and avg_price_str:
-                            avg_price = float(avg_price_str)
-                            take_profit_price = avg_price * TAKE_PROFIT_PERCENTAGE
-                            
-                            # 格式化以满足API精度要求 (需要查询具体交易对的精度规则)
-                            # 此处为草稿简化
-                            price_str = f"{take_profit_price:.2f}" 
+        logging.info(f"本轮检查结束，休眠 {LOOP_SLEEP_SECONDS / 60} 分钟...")
+        await asyncio.sleep(LOOP_SLEEP_SECONDS)
 
-                            place_sell_order(client, symbol, filled_quantity, price_str)
 
-                            # 6. 更新购买时间戳
-                            last_buy_times[symbol] = current_time
-                        else:
-                            logging.error(f"无法获取买单 {buy_order['orderId']} 的成交详情。")
+async def stream_strategy(client: Pionex, last_buy_times: Dict[str, float]) -> None:
+    """
+    推送模式：订阅 Binance 的 <symbol>@ticker 行情流，每收到一次推送就检查触发条件。
 
-                    except Exception as e:
-                        logging.error(f"处理买单后续操作时出错: {e}")
+    下跌检测延迟从最长 LOOP_SLEEP_SECONDS 降到秒级，且两次推送之间不消耗任何 REST 请求。
+    LOOP_SLEEP_SECONDS 内没有收到推送时视为连接失活并重连，同时按该间隔输出一次行情摘要。
 
-                else:
-                    logging.error(f"为 {symbol} 下买单失败或未返回订单ID。")
+    Args:
+        client: Pionex客户端对象。
+        last_buy_times: 每个交易对上次买入的时间戳。
+    """
+    # Pionex 交易对 'BTC_USDT' 对应 Binance 的 'BTCUSDT'
+    binance_to_target = {symbol.replace('_', '').upper(): symbol for symbol in TARGETS}
+    streams = '/'.join(f"{name.lower()}@ticker" for name in binance_to_target)
+    url = f"{BINANCE_STREAM_URL}?streams={streams}"
 
-        logging.info(f"本轮检查结束，休眠 {LOOP_SLEEP_SECONDS / 60} 分钟...")
-        time.sleep(LOOP_SLEEP_SECONDS)
+    latest_changes: Dict[str, float] = {}
+    last_report = time.monotonic()
+    # 正在执行中的抄底任务，避免同一交易对在下单期间被重复触发
+    buy_tasks: Dict[str, asyncio.Task] = {}
+
+    while True:
+        try:
+            async with websockets.connect(url) as ws:
+                logging.info(f"已连接 Binance 行情推送: {streams}")
+                while True:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=LOOP_SLEEP_SECONDS)
+                    ticker = json.loads(raw).get('data', {})
+                    symbol = binance_to_target.get(ticker.get('s'))
+                    if symbol is None:
+                        continue
+
+                    # Binance 推送的 'P' 字段已经是百分比，例如 "-10.5" 代表 -10.5%
+                    try:
+                        change_24h = float(ticker['P'])
+                    except (KeyError, ValueError):
+                        logging.warning(f"无法解析 {symbol} 的24小时变动数据: '{ticker.get('P')}'")
+                        continue
+                    latest_changes[symbol] = change_24h
+
+                    if time.monotonic() - last_report >= LOOP_SLEEP_SECONDS:
+                        for name, change in latest_changes.items():
+                            logging.info(f"{name} 当前24小时变动: {change:.2f}% (触发条件: < {TARGETS[name]['dip_percentage']}%)")
+                        last_report = time.monotonic()
+
+                    if change_24h >= TARGETS[symbol]['dip_percentage']:
+                        continue
+                    if symbol in buy_tasks or is_in_cooldown(symbol, last_buy_times, time.time()):
+                        continue
+
+                    logging.warning(f"!!! 触发 {symbol} 的买入条件 (24小时变动: {change_24h:.2f}%) !!!")
+                    task = asyncio.create_task(execute_dip_buy(client, symbol, last_buy_times))
+                    buy_tasks[symbol] = task
+                    task.add_done_callback(lambda _, name=symbol: buy_tasks.pop(name, None))
+        except asyncio.TimeoutError:
+            logging.warning(f"{LOOP_SLEEP_SECONDS / 60} 分钟内未收到行情推送，正在重连...")
+        except Exception as e:
+            logging.error(f"行情推送连接出错: {e}，{RECONNECT_DELAY_SECONDS} 秒后重连...")
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+def run_strategy() -> None:
+    """
+    运行“下跌猎手”策略循环的主函数。
+
+    安装了 websockets 时由 Binance 行情推送驱动，否则回退到定时轮询 Pionex 行情。
+    """
+    logging.info("启动“下跌猎手”策略...")
+    client = get_pionex_client()
+    if not client:
+        logging.critical("客户端初始化失败，策略退出。")
+        return
+
+    # 用于跟踪每个币种的上次购买时间，以实现冷却机制
+    last_buy_times: Dict[str, float] = {}
+
+    if WEBSOCKETS_AVAILABLE:
+        asyncio.run(stream_strategy(client, last_buy_times))
+    else:
+        logging.warning("websockets 未安装，回退到轮询模式。安装命令：pip install websockets")
+        asyncio.run(poll_strategy(client, last_buy_times))
 
 
 if __name__ == "__main__":
@@ -1,19 +1,57 @@
 # market_signal_monitor.py
 # This script acts as a strategic radar for detecting Bitcoin market cycle shifts based on a multi-indicator model.
 
-import requests
+# requests, pandas_ta and smtplib are imported where they are first used, so cold start
+# only pays for what a run actually needs.
+import asyncio
+import html
+import json
+import re
 import pandas as pd
-import pandas_ta as ta
-import schedule
-import time
-import smtplib
-from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+# Optional: orjson parses/serializes JSON in C, several times faster than the stdlib; fall back to json if missing
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 # Import credentials from the config file
 from config import GLASSNODE_API_KEY, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, EMAIL_SENDER, EMAIL_PASSWORD, EMAIL_RECEIVER, SMTP_SERVER, SMTP_PORT
 
+# Shared HTTP session: keep-alive connection pool with retry/backoff for Glassnode and Telegram calls.
+# Created on first use, so requests is only imported once a run actually goes to the network.
+_SESSION = None
+
+def _get_session():
+    """Returns the shared requests session, creating it on first call."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        session = requests.Session()
+        # Glassnode compresses its JSON; the bodies are handed to _json_loads as bytes, never .text
+        session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip, deflate'})
+        session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        # Publish only the fully configured session; the concurrent fetches may race here
+        _SESSION = session
+    return _SESSION
+
 # --- 1. NOTIFICATION MODULE ---
+# Payloads are serialized with _json_dumps up front instead of requests' stdlib json=
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
 def send_telegram_message(message):
     """Sends a message to the configured Telegram chat."""
     if not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
@@ -23,23 +61,31 @@ def send_telegram_message(message):
     payload = {
         'chat_id': TELEGRAM_CHAT_ID,
         'text': message,
-        'parse_mode': 'Markdown'
+        'parse_mode': 'HTML'
     }
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = _get_session().post(url, data=_json_dumps(payload), headers=_JSON_HEADERS, timeout=10)
         response.raise_for_status()
         print("Successfully sent Telegram message.")
-    except requests.exceptions.RequestException as e:
+    except Exception as e:
         print(f"Error sending Telegram message: {e}")
 
+def _html_to_text(message):
+    """Returns the plain-text version of a Telegram HTML message (tags dropped, entities unescaped)."""
+    return html.unescape(re.sub(r'<[^>]+>', '', message))
+
 def send_email_alert(subject, content):
     """Sends an email alert (optional)."""
     if not all([EMAIL_SENDER, EMAIL_PASSWORD, EMAIL_RECEIVER, SMTP_SERVER, SMTP_PORT]):
         print("Email credentials not fully configured. Skipping email alert.")
         return
         
+    import smtplib
+    from email.message import EmailMessage
+    
     msg = EmailMessage()
-    msg.set_content(content)
+    # content is the Telegram HTML alert; mail it as plain text
+    msg.set_content(_html_to_text(content))
     msg['Subject'] = subject
     msg['From'] = EMAIL_SENDER
     msg['To'] = EMAIL_RECEIVER
@@ -53,47 +99,72 @@ def send_email_alert(subject, content):
     except Exception as e:
         print(f"Error sending email: {e}")
 
+def dispatch_alerts(subject, message):
+    """Sends the Telegram and email alerts concurrently, so the slow SMTP handshake doesn't delay Telegram."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(send_telegram_message, message)
+        executor.submit(send_email_alert, subject, message)
+
 # --- 2. DATA FETCHING MODULE ---
 def get_glassnode_data(url, asset='BTC', resolution='1w'):
     """Fetches data from the Glassnode API."""
     params = {'a': asset, 'i': resolution, 'api_key': GLASSNODE_API_KEY}
     try:
-        res = requests.get(url, params=params, timeout=30)
+        res = _get_session().get(url, params=params, timeout=30)
         res.raise_for_status()
-        df = pd.read_json(res.text, convert_dates=['t'])
+    except Exception as e:
+        print(f"Error fetching Glassnode data from {url}: {e}")
+        return None
+    try:
+        df = pd.DataFrame(_json_loads(res.content))
+        df['t'] = pd.to_datetime(df['t'], unit='s')
         df.rename(columns={'t': 'time', 'v': 'value'}, inplace=True)
         df.set_index('time', inplace=True)
         return df
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching Glassnode data from {url}: {e}")
-        return None
     except (ValueError, KeyError) as e:
         print(f"Error parsing Glassnode data from {url}: {e}")
         return None
 
+def fetch_all(urls, max_workers=4):
+    """Fetches several Glassnode endpoints concurrently; returns one DataFrame (or None) per URL, in order."""
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+        return list(executor.map(get_glassnode_data, urls))
+
 # --- 3. INDICATOR CALCULATION & SIGNAL LOGIC ---
 def check_market_signals():
     """Main function to fetch, calculate, and check for market signals."""
     print(f"\n--- Running market signal check at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
     
-    # 3.1 Fetch all necessary data
+    # 3.1 Fetch all necessary data (the three requests are independent, so run them concurrently)
     print("Fetching data from Glassnode...")
-    price_df = get_glassnode_data('https://api.glassnode.com/v1/metrics/market/price_ohlc')
-    mvrv_df = get_glassnode_data('https://api.glassnode.com/v1/metrics/indicators/mvrv_z_score')
-    sopr_df = get_glassnode_data('https://api.glassnode.com/v1/metrics/indicators/sopr_adjusted')
+    urls = [
+        'https://api.glassnode.com/v1/metrics/market/price_ohlc',
+        'https://api.glassnode.com/v1/metrics/indicators/mvrv_z_score',
+        'https://api.glassnode.com/v1/metrics/indicators/sopr_adjusted',
+    ]
+    price_df, mvrv_df, sopr_df = fetch_all(urls)
     
     if price_df is None or mvrv_df is None or sopr_df is None:
         print("Failed to fetch critical data. Aborting check.")
         return
 
     # 3.2 Combine and prepare data
-    df = price_df.copy()
-    df['mvrv_z_score'] = mvrv_df['value']
-    df['sopr'] = sopr_df['value']
-    df = df[df.index > datetime.now() - timedelta(days=4*365)].dropna()
+    # Join the metrics onto the last 4 years of price weeks, starting at the first week where every
+    # series has a value, instead of copying the full frame and dropna-scanning it
+    mvrv = mvrv_df['value'].rename('mvrv_z_score')
+    sopr = sopr_df['value'].rename('sopr')
+    starts = [series.first_valid_index() for series in (price_df['c'], mvrv, sopr)]
+    if None in starts:
+        print("Not enough data for analysis. Aborting.")
+        return
+    df = price_df.loc[max([datetime.now() - timedelta(days=4*365), *starts]):].join([mvrv, sopr])
+    # Gaps after the common start are rare; only then pay for a row filter
+    if df.isna().to_numpy().any():
+        df = df.dropna()
 
     # 3.3 Calculate indicators
     print("Calculating indicators...")
+    import pandas_ta  # noqa: F401 -- registers the DataFrame.ta accessor used below
     df.ta.ema(length=20, append=True, col_names=('EMA_20',))
     df.ta.rsi(length=14, append=True, col_names=('RSI_14',))
     
@@ -105,83 +176,91 @@ def check_market_signals():
     # --- 3.4 The Dashboard Logic ---
     print("Analyzing signals...")
     
-    latest = df.iloc[-1]
-    prev1 = df.iloc[-2]
-    prev2 = df.iloc[-3]
+    # Positional NumPy views: [-1] is the latest week, [-2] / [-3] the weeks before
+    close = df['c'].to_numpy()
+    high = df['h'].to_numpy()
+    low = df['l'].to_numpy()
+    ema20 = df['EMA_20'].to_numpy()
+    rsi = df['RSI_14'].to_numpy()
+    mvrv = df['mvrv_z_score'].to_numpy()
+    sopr = df['sopr'].to_numpy()
+    latest_time = df.index[-1]
 
     # --- Bull-to-Bear Logic ---
     # Primary Condition
-    bull_to_bear_primary = latest['c'] < latest['EMA_20'] and prev1['c'] < prev1['EMA_20']
+    bull_to_bear_primary = close[-1] < ema20[-1] and close[-2] < ema20[-2]
     
     # Secondary Conditions
     bearish_confirmations = 0
     bearish_reasons = []
 
     # 1. Market Structure
-    if latest['l'] < prev1['l']:
+    if low[-1] < low[-2]:
         bearish_confirmations += 1
         bearish_reasons.append("✅ Market Structure: Lower Low")
     else:
         bearish_reasons.append("❌ Market Structure: No Lower Low")
 
     # 2. MVRV Z-Score
-    if latest['mvrv_z_score'] > 5.0 and latest['mvrv_z_score'] < prev1['mvrv_z_score']:
+    if mvrv[-1] > 5.0 and mvrv[-1] < mvrv[-2]:
         bearish_confirmations += 1
-        bearish_reasons.append(f"✅ MVRV Z-Score: High & Falling ({latest['mvrv_z_score']:.2f})")
+        bearish_reasons.append(f"✅ MVRV Z-Score: High & Falling ({mvrv[-1]:.2f})")
     else:
-        bearish_reasons.append(f"❌ MVRV Z-Score: Not High & Falling ({latest['mvrv_z_score']:.2f})")
+        bearish_reasons.append(f"❌ MVRV Z-Score: Not High & Falling ({mvrv[-1]:.2f})")
         
     # 3. aSOPR
-    if latest['sopr'] < 1.0:
+    if sopr[-1] < 1.0:
         bearish_confirmations += 1
-        bearish_reasons.append(f"✅ aSOPR: Below 1.0 ({latest['sopr']:.2f})")
+        bearish_reasons.append(f"✅ aSOPR: Below 1.0 ({sopr[-1]:.2f})")
     else:
-        bearish_reasons.append(f"❌ aSOPR: Above 1.0 ({latest['sopr']:.2f})")
+        bearish_reasons.append(f"❌ aSOPR: Above 1.0 ({sopr[-1]:.2f})")
         
     # 4. RSI
-    rsi_was_overbought = df['RSI_14'].rolling(4).max().iloc[-2] > 70
-    if rsi_was_overbought and latest['RSI_14'] < prev1['RSI_14']:
+    # Max over the 4 weeks before the latest one (same window as rolling(4).max().iloc[-2], NaN-propagating)
+    rsi_was_overbought = rsi[-5:-1].max() > 70
+    if rsi_was_overbought and rsi[-1] < rsi[-2]:
         bearish_confirmations += 1
-        bearish_reasons.append(f"✅ RSI: Falling from Overbought ({latest['RSI_14']:.2f})")
+        bearish_reasons.append(f"✅ RSI: Falling from Overbought ({rsi[-1]:.2f})")
     else:
-        bearish_reasons.append(f"❌ RSI: Not Falling from Overbought ({latest['RSI_14']:.2f})")
+        bearish_reasons.append(f"❌ RSI: Not Falling from Overbought ({rsi[-1]:.2f})")
 
     # --- Bear-to-Bull Logic ---
     # Primary Condition
-    bear_to_bull_primary = latest['c'] > latest['EMA_20'] and prev1['c'] > prev1['EMA_20'] and prev2['c'] > prev2['EMA_20']
+    bear_to_bull_primary = close[-1] > ema20[-1] and close[-2] > ema20[-2] and close[-3] > ema20[-3]
     
     # Secondary Conditions
     bullish_confirmations = 0
     bullish_reasons = []
     
     # 1. Market Structure
-    if latest['h'] > prev1['h']:
+    if high[-1] > high[-2]:
         bullish_confirmations += 1
         bullish_reasons.append("✅ Market Structure: Higher High")
     else:
         bullish_reasons.append("❌ Market Structure: No Higher High")
 
     # 2. MVRV Z-Score
-    if latest['mvrv_z_score'] > 0.5 and latest['mvrv_z_score'] > prev1['mvrv_z_score']:
+    if mvrv[-1] > 0.5 and mvrv[-1] > mvrv[-2]:
         bullish_confirmations += 1
-        bullish_reasons.append(f"✅ MVRV Z-Score: Rising from Bottom ({latest['mvrv_z_score']:.2f})")
+        bullish_reasons.append(f"✅ MVRV Z-Score: Rising from Bottom ({mvrv[-1]:.2f})")
     else:
-        bullish_reasons.append(f"❌ MVRV Z-Score: Not Rising from Bottom ({latest['mvrv_z_score']:.2f})")
+        bullish_reasons.append(f"❌ MVRV Z-Score: Not Rising from Bottom ({mvrv[-1]:.2f})")
 
     # 3. aSOPR
-    if latest['sopr'] > 1.0:
+    if sopr[-1] > 1.0:
         bullish_confirmations += 1
-        bullish_reasons.append(f"✅ aSOPR: Above 1.0 ({latest['sopr']:.2f})")
+        bullish_reasons.append(f"✅ aSOPR: Above 1.0 ({sopr[-1]:.2f})")
     else:
-        bullish_reasons.append(f"❌ aSOPR: Below 1.0 ({latest['sopr']:.2f})")
+        bullish_reasons.append(f"❌ aSOPR: Below 1.0 ({sopr[-1]:.2f})")
         
     # 4. RSI
-    rsi_was_oversold = df['RSI_14'].rolling(8).min().iloc[-2] < 30
-    if rsi_was_oversold and latest['RSI_14'] > prev1['RSI_14']:
+    # Min over the 8 weeks before the latest one (same window as rolling(8).min().iloc[-2])
+    rsi_was_oversold = rsi[-9:-1].min() < 30
+    if rsi_was_oversold and rsi[-1] > rsi[-2]:
         bullish_confirmations += 1
-        bullish_reasons.append(f"✅ RSI: Rising from Oversold ({latest['RSI_14']:.2f})")
+        bullish_reasons.append(f"✅ RSI: Rising from Oversold ({rsi[-1]:.2f})")
     else:
-        bullish_reasons.append(f"❌ RSI: Not Rising from Oversold ({latest['RSI_14']:.2f})")
+        bullish_reasons.append(f"❌ RSI: Not Rising from Oversold ({rsi[-1]:.2f})")
 
 
     # --- 3.5 Final Decision Engine ---
@@ -191,41 +270,54 @@ def check_market_signals():
     if bull_to_bear_primary and bearish_confirmations >= 2:
         alert_subject = "STRATEGIC ALERT: Bull-to-Bear Signal DETECTED!"
         alert_message = (
-            f"🚨 **{alert_subject}** 🚨\n\n"
-            f"**Date:** {latest.name.strftime('%Y-%m-%d')}\n"
-            f"**BTC Price:** ${latest['c']:.2f}\n\n"
-            f"**Primary Condition Met:**\n✅ Price has closed below the 20-Week EMA for 2 consecutive weeks.\n\n"
-            f"**Confirmation Indicators ({bearish_confirmations}/4 Met):**\n" + "\n".join(bearish_reasons) +
-            f"\n\n**Recommendation:**\nInitiate 'Strategic Contraction' phase as per the investment plan."
+            f"🚨 <b>{alert_subject}</b> 🚨\n\n"
+            f"<b>Date:</b> {latest_time.strftime('%Y-%m-%d')}\n"
+            f"<b>BTC Price:</b> ${close[-1]:.2f}\n\n"
+            f"<b>Primary Condition Met:</b>\n✅ Price has closed below the 20-Week EMA for 2 consecutive weeks.\n\n"
+            f"<b>Confirmation Indicators ({bearish_confirmations}/4 Met):</b>\n" + html.escape("\n".join(bearish_reasons), quote=False) +
+            f"\n\n<b>Recommendation:</b>\nInitiate 'Strategic Contraction' phase as per the investment plan."
         )
     elif bear_to_bull_primary and bullish_confirmations >= 2:
         alert_subject = "STRATEGIC ALERT: Bear-to-Bull Signal DETECTED!"
         alert_message = (
-            f"✅ **{alert_subject}** ✅\n\n"
-            f"**Date:** {latest.name.strftime('%Y-%m-%d')}\n"
-            f"**BTC Price:** ${latest['c']:.2f}\n\n"
-            f"**Primary Condition Met:**\n✅ Price has closed above the 20-Week EMA for 3 consecutive weeks.\n\n"
-            f"**Confirmation Indicators ({bullish_confirmations}/4 Met):**\n" + "\n".join(bullish_reasons) +
-            f"\n\n**Recommendation:**\nInitiate 'Strategic Trend Deployment' phase as per the investment plan."
+            f"✅ <b>{alert_subject}</b> ✅\n\n"
+            f"<b>Date:</b> {latest_time.strftime('%Y-%m-%d')}\n"
+            f"<b>BTC Price:</b> ${close[-1]:.2f}\n\n"
+            f"<b>Primary Condition Met:</b>\n✅ Price has closed above the 20-Week EMA for 3 consecutive weeks.\n\n"
+            f"<b>Confirmation Indicators ({bullish_confirmations}/4 Met):</b>\n" + html.escape("\n".join(bullish_reasons), quote=False) +
+            f"\n\n<b>Recommendation:</b>\nInitiate 'Strategic Trend Deployment' phase as per the investment plan."
         )
 
     if alert_message:
         print(f"!!! {alert_subject} !!!")
-        send_telegram_message(alert_message)
-        send_email_alert(alert_subject, alert_message)
+        dispatch_alerts(alert_subject, alert_message)
     else:
         print("No definitive signal detected. Market state is neutral or consolidating. All clear.")
 
 
 # --- 4. SCHEDULER ---
+def seconds_until_next_run(weekday=0, hour=2, minute=0):
+    """Returns the number of seconds until the next given weekday (Monday = 0) at hour:minute."""
+    now = datetime.now()
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    next_run += timedelta(days=(weekday - now.weekday()) % 7)
+    if next_run <= now:
+        next_run += timedelta(days=7)
+    return (next_run - now).total_seconds()
+
+async def run_weekly(job):
+    """Sleeps until each Monday 02:00 and runs the job, instead of waking up every minute to poll."""
+    while True:
+        delay = seconds_until_next_run()
+        # Sleep at most an hour at a time, so clock changes and suspend/resume are picked up
+        await asyncio.sleep(min(delay, 3600))
+        if delay <= 3600:
+            job()
+
 if __name__ == "__main__":
     print("Starting the Market Signal Monitor.")
     check_market_signals()
     
     # Best practice: run on Monday morning to get the finalized weekly candle data from the previous week.
-    schedule.every().monday.at("02:00").do(check_market_signals)
-    
     print("Scheduler is running. Waiting for the next scheduled check...")
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    asyncio.run(run_weekly(check_market_signals))
@@ -2,15 +2,34 @@
 # Enhanced Bitcoin market cycle detection with multi-indicator scoring system
 # 增强版比特币市场周期检测系统，使用多指标评分机制
 
+from __future__ import annotations
+
 import sys
 import os
-import pandas as pd
-import pandas_ta as ta
-import schedule
+import asyncio
+import copy
+import functools
+import html
+import json
+import math
+import pickle
+import re
+import signal
+import threading
 import time
+import numpy as np
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Dict, Final, List, Optional, Tuple
+
+# pandas is only imported by the functions that build frames, so the import (several
+# hundred ms) is paid once a run actually fetches data
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -39,38 +58,143 @@ except ImportError:
     CONFIG_AVAILABLE = False
     logging.warning("config.py not found. Notifications will be disabled.")
 
+# Optional: orjson parses/serializes JSON in C, several times faster than the stdlib; fall back to json if missing
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Optional: pyarrow lets the weekly candles be cached as Parquet between runs
+PARQUET_AVAILABLE = find_spec('pyarrow') is not None
+
+# Optional: numba JIT-compiles the indicator and scoring kernels; without it they run as plain Python
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+    # Explicit signatures compile eagerly at import (and hit the on-disk cache on restarts),
+    # so the first weekly check pays no type-inference cost. Readonly 'A' arrays accept both
+    # pandas' readonly column views and ordinary NumPy buffers.
+    _F8_ARRAY = types.Array(types.float64, 1, 'A', readonly=True)
+    _INDICATORS_SIG = types.Tuple((types.float64[:, :], types.int64[:], types.float64[:], types.float64[:], types.float64))(
+        _F8_ARRAY, _F8_ARRAY, _F8_ARRAY, _F8_ARRAY)
+    _SCORE_SIG = types.Tuple((types.int64, types.int64[:], types.float64[:]))(*(_F8_ARRAY,) * 13, types.int64)
+except ImportError:
+    NUMBA_AVAILABLE = False
+    _INDICATORS_SIG = _SCORE_SIG = None
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so the kernels still run without numba"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Local state between runs (indicator state, caches)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+# Per-user cache of recent API responses, shared by every checkout
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'crypto-plan')
+
+# ============================================================================
+# HTTP SESSION
+# ============================================================================
+
+_SESSION = None
+
+
+def _get_session():
+    """Return the shared keep-alive HTTP session (created on first use)"""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        # Glassnode compresses its JSON; the bodies are handed to _json_loads as bytes, never .text
+        session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip, deflate'})
+        session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        # Publish only the fully configured session; the concurrent fetches may race here
+        _SESSION = session
+    return _SESSION
+
+
 # ============================================================================
 # NOTIFICATION MODULE
 # ============================================================================
 
+# Payloads are serialized with _json_dumps up front instead of requests' stdlib json=
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Alerts are sent from background workers so check_market_signals (and the scheduler) never
+# waits on Telegram/SMTP; pending alerts are still flushed when the interpreter exits
+_ALERT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='alert')
+
+# Telegram sends are serialized and spaced out (~30 messages/second per bot); a 429 pauses
+# the queue for the retry_after Telegram asks for
+_TELEGRAM_LOCK = threading.Lock()
+_TELEGRAM_MIN_INTERVAL = 1 / 30
+_TELEGRAM_MAX_ATTEMPTS = 3
+_last_telegram_send = 0.0
+
+
 def send_telegram_message(message: str) -> None:
     """Send message to Telegram"""
+    global _last_telegram_send
+    
     if not CONFIG_AVAILABLE or not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
         logging.info("Telegram not configured. Message:")
         logging.info(message)
         return
     
-    import requests
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {
         'chat_id': TELEGRAM_CHAT_ID,
         'text': message,
-        'parse_mode': 'Markdown'
+        'parse_mode': 'HTML'
     }
+    data = _json_dumps(payload)
     try:
-        response = requests.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-        logging.info("Telegram message sent successfully")
+        with _TELEGRAM_LOCK:
+            for _ in range(_TELEGRAM_MAX_ATTEMPTS):
+                wait = _last_telegram_send + _TELEGRAM_MIN_INTERVAL - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                _last_telegram_send = time.monotonic()
+                
+                response = _get_session().post(url, data=data, headers=_JSON_HEADERS, timeout=10)
+                if response.status_code == 429:
+                    retry_after = _json_loads(response.content).get('parameters', {}).get('retry_after', 1)
+                    logging.warning(f"Telegram rate limit hit, retrying in {retry_after}s")
+                    time.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                logging.info("Telegram message sent successfully")
+                return
+        logging.error("Error sending Telegram message: still rate limited after retries")
     except Exception as e:
         logging.error(f"Error sending Telegram message: {e}")
 
 
+def _html_to_text(message: str) -> str:
+    """Plain-text version of a Telegram HTML message: tags dropped, entities unescaped"""
+    return html.unescape(re.sub(r'<[^>]+>', '', message))
+
+
 def send_email_alert(subject: str, content: str) -> None:
     """Send email alert (optional)"""
     if not CONFIG_AVAILABLE or not all([EMAIL_SENDER, EMAIL_PASSWORD, EMAIL_RECEIVER]):
@@ -82,7 +206,8 @@ def send_email_alert(subject: str, content: str) -> None:
     from email.message import EmailMessage
     
     msg = EmailMessage()
-    msg.set_content(content)
+    # content is the Telegram HTML alert; mail it as plain text
+    msg.set_content(_html_to_text(content))
     msg['Subject'] = subject
     msg['From'] = EMAIL_SENDER
     msg['To'] = EMAIL_RECEIVER
@@ -97,14 +222,154 @@ def send_email_alert(subject: str, content: str) -> None:
         logging.error(f"Error sending email: {e}")
 
 
+def dispatch_alerts(subject: str, message: str, send_email: bool = True) -> None:
+    """
+    Queue the Telegram alert and (optionally) the email alert on the background workers
+    
+    Returns immediately. The two are independent I/O paths and run concurrently, so
+    delivery takes as long as the slower one (usually the SMTP STARTTLS handshake).
+    """
+    _ALERT_EXECUTOR.submit(send_telegram_message, message)
+    if send_email:
+        _ALERT_EXECUTOR.submit(send_email_alert, subject, message)
+
+
 # ============================================================================
 # DATA FETCHING MODULE
 # ============================================================================
 
+def ttl_cache(seconds: float):
+    """
+    Memoize a fetcher's results for `seconds`, in memory and on disk
+    
+    Entries are keyed on the call arguments and pickled to CACHE_DIR/<function>.pkl,
+    so a restarted process (or a manual run between scheduled ones) still hits the
+    cache. Expiry uses wall-clock time because it has to survive restarts. None
+    results (failed fetches) are never cached, and hits are returned as copies so
+    callers can modify them freely.
+    """
+    def decorator(func):
+        path = os.path.join(CACHE_DIR, f"{func.__name__}.pkl")
+        lock = threading.Lock()
+        entries: Dict[tuple, Tuple[float, object]] = {}
+        loaded = False
+        
+        def load():
+            try:
+                with open(path, 'rb') as f:
+                    entries.update(pickle.load(f))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Could not load response cache from {path}: {e}")
+        
+        def save():
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logging.warning(f"Could not save response cache to {path}: {e}")
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal loaded
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                if not loaded:
+                    load()
+                    loaded = True
+                hit = entries.get(key)
+            if hit is not None and hit[0] > time.time():
+                logging.info(f"{func.__name__}: using cached response")
+                return copy.copy(hit[1])
+            
+            value = func(*args, **kwargs)
+            if value is not None:
+                with lock:
+                    now = time.time()
+                    for stale in [k for k, (expires, _) in entries.items() if expires <= now]:
+                        del entries[stale]
+                    entries[key] = (now + seconds, value)
+                    save()
+            return copy.copy(value)
+        
+        return wrapper
+    return decorator
+
+
+# Candle length per timeframe, used to work out how many candles the cache is missing
+_TIMEFRAME_PERIODS = {
+    '1h': timedelta(hours=1),
+    '4h': timedelta(hours=4),
+    '1d': timedelta(days=1),
+    '1w': timedelta(weeks=1),
+}
+
+
+def price_cache_path(symbol: str, timeframe: str) -> str:
+    """Parquet file the candles for a symbol/timeframe are cached in"""
+    return os.path.join(DATA_DIR, f"{symbol.split('/')[0].lower()}_{timeframe}.parquet")
+
+
+def load_price_cache(path: str) -> Optional[pd.DataFrame]:
+    """Load cached candles, or None if missing/unreadable"""
+    if not PARQUET_AVAILABLE or not os.path.exists(path):
+        return None
+    try:
+        import pandas as pd
+        return pd.read_parquet(path)
+    except Exception as e:
+        logging.warning(f"Could not load price cache from {path}: {e}")
+        return None
+
+
+def save_price_cache(df: pd.DataFrame, path: str) -> None:
+    """Persist candles to the Parquet cache (written to a temp file first, then swapped in)"""
+    if not PARQUET_AVAILABLE:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.error(f"Error saving price cache to {path}: {e}")
+
+
+def _fetch_klines(symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+    """Fetch candles from Binance, renamed to o/h/l/c/v, indexed by time and stored as float32"""
+    fetcher = CryptoDataFetcher(data_source='binance')
+    df = fetcher.get_historical_klines(symbol, timeframe, limit)
+    
+    if df is None or df.empty:
+        return None
+    
+    # Rename columns to match expected format
+    df.rename(columns={
+        'timestamp': 'time',
+        'open': 'o',
+        'high': 'h',
+        'low': 'l',
+        'close': 'c',
+        'volume': 'v'
+    }, inplace=True)
+    
+    df.set_index('time', inplace=True)
+    # float32 is plenty for threshold comparisons and halves the memory footprint
+    return df.astype(dict.fromkeys(('o', 'h', 'l', 'c', 'v'), np.float32))
+
+
 def get_price_data(symbol: str = 'BTC/USDT', timeframe: str = '1w', limit: int = 200) -> Optional[pd.DataFrame]:
     """
     Fetch price data using CryptoDataFetcher
     
+    Candles are cached as Parquet between runs; when the cache is recent enough only
+    the candles since its last (possibly still forming) candle are fetched. This is
+    the only candle cache: every call refetches at least that last candle.
+    
     Args:
         symbol: Trading pair (default: 'BTC/USDT')
         timeframe: Timeframe for klines (default: '1w' for weekly)
@@ -113,25 +378,27 @@ def get_price_data(symbol: str = 'BTC/USDT', timeframe: str = '1w', limit: int =
     Returns:
         DataFrame with OHLCV data, or None if failed
     """
+    import pandas as pd
     try:
-        fetcher = CryptoDataFetcher(data_source='binance')
-        df = fetcher.get_historical_klines(symbol, timeframe, limit)
+        cache_path = price_cache_path(symbol, timeframe)
+        cached = load_price_cache(cache_path)
+        
+        fetch_limit = limit
+        period = _TIMEFRAME_PERIODS.get(timeframe)
+        if cached is not None and len(cached) >= limit and period is not None:
+            # Refetch the last cached candle too, it may have closed since
+            missed = int((pd.Timestamp.now(tz='UTC').tz_localize(None) - cached.index.max()) // period) + 1
+            fetch_limit = min(max(missed, 2), limit)
         
-        if df is None or df.empty:
+        df = _fetch_klines(symbol, timeframe, fetch_limit)
+        if df is None:
             logging.error(f"Failed to fetch data for {symbol} {timeframe}")
             return None
         
-        # Rename columns to match expected format
-        df.rename(columns={
-            'timestamp': 'time',
-            'open': 'o',
-            'high': 'h',
-            'low': 'l',
-            'close': 'c',
-            'volume': 'v'
-        }, inplace=True)
-        
-        df.set_index('time', inplace=True)
+        if fetch_limit < limit:
+            df = pd.concat([cached[cached.index < df.index.min()], df]).iloc[-limit:]
+            logging.info(f"Fetched {fetch_limit} new candles on top of the cache for {symbol} {timeframe}")
+        save_price_cache(df, cache_path)
         
         logging.info(f"Successfully fetched {len(df)} candles for {symbol} {timeframe}")
         return df
@@ -141,6 +408,7 @@ def get_price_data(symbol: str = 'BTC/USDT', timeframe: str = '1w', limit: int =
         return None
 
 
+@ttl_cache(3600)
 def get_glassnode_data(url: str, asset: str = 'BTC', resolution: str = '1w') -> Optional[pd.DataFrame]:
     """
     Fetch data from Glassnode API (optional, requires API key)
@@ -153,19 +421,23 @@ def get_glassnode_data(url: str, asset: str = 'BTC', resolution: str = '1w') ->
     Returns:
         DataFrame with Glassnode data, or None if failed/unavailable
     """
+    import pandas as pd
     if not CONFIG_AVAILABLE or not GLASSNODE_API_KEY or GLASSNODE_API_KEY == 'YOUR_GLASSNODE_API_KEY':
         logging.info("Glassnode API key not configured. Skipping chain data.")
         return None
     
-    import requests
     params = {'a': asset, 'i': resolution, 'api_key': GLASSNODE_API_KEY}
     
     try:
-        res = requests.get(url, params=params, timeout=30)
+        res = _get_session().get(url, params=params, timeout=30)
         res.raise_for_status()
-        df = pd.read_json(res.text, convert_dates=['t'])
-        df.rename(columns={'t': 'time', 'v': 'value'}, inplace=True)
-        df.set_index('time', inplace=True)
+        points = _json_loads(res.content)
+        # Build the typed columns directly instead of letting pandas infer dtypes from the
+        # list of {'t', 'v'} records and then renaming/re-indexing (null values become NaN)
+        times = np.fromiter((p['t'] for p in points), dtype=np.int64, count=len(points))
+        values = np.fromiter((np.nan if p['v'] is None else p['v'] for p in points),
+                             dtype=np.float32, count=len(points))
+        df = pd.DataFrame({'value': values}, index=pd.DatetimeIndex(pd.to_datetime(times, unit='s'), name='time'))
         logging.info(f"Successfully fetched Glassnode data from {url}")
         return df
     except Exception as e:
@@ -173,10 +445,132 @@ def get_glassnode_data(url: str, asset: str = 'BTC', resolution: str = '1w') ->
         return None
 
 
+# On-chain metrics used as optional confirmation by the scorers
+CHAIN_DATA_URLS = (
+    'https://api.glassnode.com/v1/metrics/indicators/mvrv_z_score',
+    'https://api.glassnode.com/v1/metrics/indicators/sopr_adjusted',
+)
+
+
+def fetch_all(urls, max_workers: int = 4) -> List[Optional[pd.DataFrame]]:
+    """
+    Fetch several Glassnode endpoints concurrently over the shared session
+    
+    Returns:
+        One DataFrame (or None) per URL, in input order
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+        return list(executor.map(get_glassnode_data, urls))
+
+
 # ============================================================================
 # TECHNICAL INDICATORS CALCULATION
 # ============================================================================
 
+# Output rows of _compute_all_indicators, in order
+_INDICATOR_COLUMNS = ('EMA_20', 'EMA_50', 'EMA_200', 'RSI_14', 'MACD', 'MACD_hist', 'MACD_signal',
+                      'BB_lower', 'BB_middle', 'BB_upper', 'Volume_MA', 'OBV', 'ATR')
+
+# Seeded averages tracked by the kernel, in accumulator order: IndicatorState field, length, alpha
+_AVERAGE_FIELDS = ('ema_20', 'ema_50', 'ema_200', 'ema_12', 'ema_26', 'macd_signal', 'avg_gain', 'avg_loss', 'atr')
+_AVERAGE_LENGTHS = np.array([20, 50, 200, 12, 26, 9, 14, 14, 14], dtype=np.int64)
+_AVERAGE_ALPHAS = np.array([2.0 / (length + 1) for length in _AVERAGE_LENGTHS[:6]] + [1.0 / 14] * 3)
+
+# Bollinger Band / Volume MA window
+_BB_WINDOW = 20
+
+
+@njit(cache=True)
+def _seeded_update(k, x, counts, totals, values):
+    """Kernel version of _SeededAverage.update for accumulator k (NaN is skipped)"""
+    if x != x:
+        return values[k]
+    counts[k] += 1
+    if counts[k] <= _AVERAGE_LENGTHS[k]:
+        totals[k] += x
+        if counts[k] == _AVERAGE_LENGTHS[k]:
+            values[k] = totals[k] / _AVERAGE_LENGTHS[k]
+    else:
+        values[k] += _AVERAGE_ALPHAS[k] * (x - values[k])
+    return values[k]
+
+
+@njit(_INDICATORS_SIG, cache=True)
+def _compute_all_indicators(high, low, close, volume):
+    """
+    Compute every indicator in one pass over the candles
+    
+    Performs exactly the steps of update_indicators_streaming, candle by candle, so a
+    history replayed here and one streamed through IndicatorState agree, and the final
+    accumulators can seed an IndicatorState (see _replay_indicators).
+    
+    Returns:
+        Tuple of (indicators, counts, totals, values, obv): indicators has shape
+        (len(_INDICATOR_COLUMNS), n), NaN where an indicator is not yet defined; the
+        next three are the final state of the _AVERAGE_FIELDS accumulators
+    """
+    n = close.shape[0]
+    out = np.full((13, n), np.nan)
+    counts = np.zeros(9, dtype=np.int64)
+    totals = np.zeros(9)
+    values = np.full(9, np.nan)
+    obv = 0.0
+    
+    for i in range(n):
+        x = close[i]
+        
+        out[0, i] = _seeded_update(0, x, counts, totals, values)
+        out[1, i] = _seeded_update(1, x, counts, totals, values)
+        out[2, i] = _seeded_update(2, x, counts, totals, values)
+        macd = _seeded_update(3, x, counts, totals, values) - _seeded_update(4, x, counts, totals, values)
+        macd_signal = _seeded_update(5, macd, counts, totals, values)
+        out[4, i] = macd
+        out[5, i] = macd - macd_signal
+        out[6, i] = macd_signal
+        
+        if i == 0:
+            obv += volume[0]  # The first candle counts as an up candle
+        else:
+            prev_close = close[i - 1]
+            change = x - prev_close
+            gain = _seeded_update(6, max(change, 0.0), counts, totals, values)
+            loss = _seeded_update(7, max(-change, 0.0), counts, totals, values)
+            if gain + loss > 0:
+                out[3, i] = 100.0 * gain / (gain + loss)
+            tr = max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+            out[12, i] = _seeded_update(8, tr, counts, totals, values)
+            if change > 0:
+                obv += volume[i]
+            elif change < 0:
+                obv -= volume[i]
+        out[11, i] = obv
+        
+        # Bollinger Bands (2 sample std, ddof=1 like pandas_ta) and Volume MA over the last 20 candles, summed
+        # oldest first like the streaming deques
+        if i >= _BB_WINDOW - 1:
+            close_sum = 0.0
+            volume_sum = 0.0
+            for j in range(i - _BB_WINDOW + 1, i + 1):
+                close_sum += close[j]
+                volume_sum += volume[j]
+            middle = close_sum / _BB_WINDOW
+            sq_sum = 0.0
+            for j in range(i - _BB_WINDOW + 1, i + 1):
+                sq_sum += (close[j] - middle) ** 2
+            std = np.sqrt(sq_sum / (_BB_WINDOW - 1))
+            out[7, i] = middle - 2 * std
+            out[8, i] = middle
+            out[9, i] = middle + 2 * std
+            out[10, i] = volume_sum / _BB_WINDOW
+    
+    return out, counts, totals, values, obv
+
+
+def _indicator_inputs(df: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+    """High, low, close and volume as float64 (stored as float32; the running sums accumulate in float64)"""
+    return tuple(df[col].to_numpy(dtype=np.float64) for col in ('h', 'l', 'c', 'v'))
+
+
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate all technical indicators needed for signal detection
@@ -189,334 +583,600 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     logging.info("Calculating technical indicators...")
     
-    # EMA (Exponential Moving Averages)
-    df['EMA_20'] = ta.ema(df['c'], length=20)
-    df['EMA_50'] = ta.ema(df['c'], length=50)
-    df['EMA_200'] = ta.ema(df['c'], length=200)
-    
-    # RSI (Relative Strength Index)
-    df['RSI_14'] = ta.rsi(df['c'], length=14)
-    
-    # MACD (Moving Average Convergence Divergence)
-    macd = ta.macd(df['c'], fast=12, slow=26, signal=9)
-    if macd is not None and not macd.empty:
-        macd_cols = macd.columns.tolist()
-        if len(macd_cols) >= 3:
-            df['MACD'] = macd.iloc[:, 0]         # MACD line
-            df['MACD_hist'] = macd.iloc[:, 1]    # Histogram
-            df['MACD_signal'] = macd.iloc[:, 2]  # Signal line
-    
-    # Bollinger Bands
-    bbands = ta.bbands(df['c'], length=20, std=2)
-    if bbands is not None and not bbands.empty:
-        # Column names may vary, try to find them
-        bb_cols = bbands.columns.tolist()
-        if len(bb_cols) >= 3:
-            df['BB_lower'] = bbands.iloc[:, 0]   # First column is lower band
-            df['BB_middle'] = bbands.iloc[:, 1]  # Second column is middle band
-            df['BB_upper'] = bbands.iloc[:, 2]   # Third column is upper band
-    
-    # Volume indicators
-    df['Volume_MA'] = df['v'].rolling(window=20).mean()
-    
-    # OBV (On-Balance Volume)
-    df['OBV'] = ta.obv(df['c'], df['v'])
-    
-    # ATR (Average True Range)
-    df['ATR'] = ta.atr(df['h'], df['l'], df['c'], length=14)
+    indicators = _compute_all_indicators(*_indicator_inputs(df))[0]
+    for name, values in zip(_INDICATOR_COLUMNS, indicators):
+        df[name] = values
     
     logging.info("Technical indicators calculated successfully")
     return df
 
 
-# ============================================================================
-# SIGNAL SCORING SYSTEM
-# ============================================================================
+@dataclass
+class _SeededAverage:
+    """Exponential average seeded with the SMA of its first `length` inputs (pandas_ta / TA-Lib convention)"""
+    length: int
+    alpha: float
+    count: int = 0
+    total: float = 0.0
+    value: float = math.nan
+    
+    def update(self, x: float) -> float:
+        """Feed one value (NaN is skipped); returns NaN until `length` values have been seen"""
+        if math.isnan(x):
+            return self.value
+        self.count += 1
+        if self.count <= self.length:
+            self.total += x
+            if self.count == self.length:
+                self.value = self.total / self.length
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+def _ema(length: int) -> _SeededAverage:
+    return _SeededAverage(length, 2.0 / (length + 1))
+
+
+def _wilder(length: int) -> _SeededAverage:
+    return _SeededAverage(length, 1.0 / length)
+
 
-def calculate_bear_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = None) -> Tuple[int, Dict[str, str]]:
+# Bumped whenever the persisted indicator values change, so older states are replayed rather than reused
+_INDICATOR_STATE_VERSION = 2
+
+
+@dataclass
+class IndicatorState:
     """
-    Calculate bear signal score (0-100)
+    Running state of the weekly indicators after the last closed candle
+    
+    Every indicator is a recurrence (EMA, Wilder average, running sum) or a
+    20-candle window, so this is all that is needed to extend them by one candle.
+    """
+    last_time: Optional[pd.Timestamp] = None
+    prev_close: float = math.nan
+    obv: float = 0.0
+    ema_20: _SeededAverage = field(default_factory=lambda: _ema(20))
+    ema_50: _SeededAverage = field(default_factory=lambda: _ema(50))
+    ema_200: _SeededAverage = field(default_factory=lambda: _ema(200))
+    ema_12: _SeededAverage = field(default_factory=lambda: _ema(12))
+    ema_26: _SeededAverage = field(default_factory=lambda: _ema(26))
+    macd_signal: _SeededAverage = field(default_factory=lambda: _ema(9))
+    avg_gain: _SeededAverage = field(default_factory=lambda: _wilder(14))
+    avg_loss: _SeededAverage = field(default_factory=lambda: _wilder(14))
+    atr: _SeededAverage = field(default_factory=lambda: _wilder(14))
+    closes: deque = field(default_factory=lambda: deque(maxlen=20))
+    volumes: deque = field(default_factory=lambda: deque(maxlen=20))
+    # (time, indicator values) of the latest candles, enough for the scoring window
+    recent: deque = field(default_factory=lambda: deque(maxlen=_SCORE_WINDOW))
+    version: int = field(default_factory=lambda: _INDICATOR_STATE_VERSION)
+
+
+def update_indicators_streaming(state: IndicatorState, row: pd.Series) -> Tuple[IndicatorState, Dict[str, float]]:
+    """
+    Advance the indicator state by one candle in O(1)
     
     Args:
-        df: DataFrame with price and indicator data
-        chain_data: Optional dictionary with chain data (MVRV, aSOPR)
+        state: State after the previous candle (updated in place)
+        row: Candle with 'h', 'l', 'c', 'v' columns and its open time as row.name
         
     Returns:
-        Tuple of (score, reasons_dict)
+        Tuple of (state, indicator values for this candle)
+    """
+    close, high, low, volume = float(row['c']), float(row['h']), float(row['l']), float(row['v'])
+    prev_close = state.prev_close
+    
+    ema_20 = state.ema_20.update(close)
+    ema_50 = state.ema_50.update(close)
+    ema_200 = state.ema_200.update(close)
+    macd = state.ema_12.update(close) - state.ema_26.update(close)
+    macd_signal = state.macd_signal.update(macd)
+    
+    if math.isnan(prev_close):
+        rsi = atr = math.nan
+        state.obv += volume  # The first candle counts as an up candle
+    else:
+        change = close - prev_close
+        gain = state.avg_gain.update(max(change, 0.0))
+        loss = state.avg_loss.update(max(-change, 0.0))
+        rsi = 100.0 * gain / (gain + loss) if gain + loss > 0 else math.nan
+        atr = state.atr.update(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+        if change:
+            state.obv += math.copysign(volume, change)
+    
+    state.closes.append(close)
+    state.volumes.append(volume)
+    if len(state.closes) == state.closes.maxlen:
+        bb_middle = sum(state.closes) / len(state.closes)
+        bb_std = math.sqrt(sum((x - bb_middle) ** 2 for x in state.closes) / (len(state.closes) - 1))
+        volume_ma = sum(state.volumes) / len(state.volumes)
+    else:
+        bb_middle = bb_std = volume_ma = math.nan
+    
+    values = {
+        'EMA_20': ema_20,
+        'EMA_50': ema_50,
+        'EMA_200': ema_200,
+        'RSI_14': rsi,
+        'MACD': macd,
+        'MACD_hist': macd - macd_signal,
+        'MACD_signal': macd_signal,
+        'BB_lower': bb_middle - 2 * bb_std,
+        'BB_middle': bb_middle,
+        'BB_upper': bb_middle + 2 * bb_std,
+        'Volume_MA': volume_ma,
+        'OBV': state.obv,
+        'ATR': atr,
+    }
+    state.prev_close = close
+    state.last_time = row.name
+    state.recent.append((row.name, values))
+    return state, values
+
+
+def indicator_state_path(symbol: str, timeframe: str) -> str:
+    """File the indicator state for a symbol/timeframe is persisted to"""
+    return os.path.join(DATA_DIR, f"indicator_state_{symbol.replace('/', '')}_{timeframe}.pkl")
+
+
+def load_indicator_state(path: str) -> Optional[IndicatorState]:
+    """Load a persisted IndicatorState, or None if missing/unreadable/from an older version"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except Exception as e:
+        logging.warning(f"Could not load indicator state from {path}: {e}")
+        return None
+    if not isinstance(state, IndicatorState) or getattr(state, 'version', None) != _INDICATOR_STATE_VERSION:
+        return None
+    return state
+
+
+def save_indicator_state(state: IndicatorState, path: str) -> None:
+    """Persist the indicator state (written to a temp file first, then swapped in)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.error(f"Error saving indicator state to {path}: {e}")
+
+
+def _replay_indicators(df: pd.DataFrame) -> IndicatorState:
     """
-    score = 0
-    reasons = {}
+    Build the IndicatorState after the last candle of `df` in one kernel pass
     
-    latest = df.iloc[-1]
-    prev1 = df.iloc[-2]
-    prev2 = df.iloc[-3] if len(df) >= 3 else prev1
+    Equivalent to streaming every candle through update_indicators_streaming, without
+    the per-row Python overhead; used when there is no usable persisted state.
+    """
+    state = IndicatorState()
+    if len(df) == 0:
+        return state
+    
+    high, low, close, volume = _indicator_inputs(df)
+    indicators, counts, totals, values, obv = _compute_all_indicators(high, low, close, volume)
+    for name, count, total, value in zip(_AVERAGE_FIELDS, counts.tolist(), totals.tolist(), values.tolist()):
+        average = getattr(state, name)
+        average.count, average.total, average.value = count, total, value
+    state.prev_close = float(close[-1])
+    state.obv = float(obv)
+    state.closes.extend(close[-_BB_WINDOW:].tolist())
+    state.volumes.extend(volume[-_BB_WINDOW:].tolist())
+    state.last_time = df.index[-1]
+    window = slice(-state.recent.maxlen, None)
+    state.recent.extend((time, dict(zip(_INDICATOR_COLUMNS, row)))
+                        for time, row in zip(df.index[window], indicators[:, window].T.tolist()))
+    return state
+
+
+def calculate_indicators_streaming(df: pd.DataFrame, state_path: str) -> pd.DataFrame:
+    """
+    Calculate indicators incrementally from the persisted IndicatorState
     
-    # === PRIMARY CONDITIONS (40 points) ===
+    Closed candles newer than the state are committed to it one by one; the last
+    (still forming) candle is evaluated on a copy and never persisted. Without a
+    usable state (first run, or a gap since the last run) the closed history is
+    replayed once through the fused kernel.
     
-    # Price below 20-week EMA (20 points)
-    if pd.notna(latest['EMA_20']) and latest['c'] < latest['EMA_20']:
-        if pd.notna(prev1['EMA_20']) and prev1['c'] < prev1['EMA_20']:
-            score += 20
-            reasons['EMA_20'] = "✅ [20分] 价格连续2周低于20周EMA"
-        else:
-            score += 10
-            reasons['EMA_20'] = "🟡 [10分] 价格低于20周EMA（仅1周）"
+    Args:
+        df: DataFrame with OHLCV data indexed by candle time
+        state_path: Where the state is loaded from and saved to
+        
+    Returns:
+        DataFrame with the indicator columns added; only the trailing scoring
+        window carries values, which is all the signal scorers read
+    """
+    import pandas as pd
+    logging.info("Updating technical indicators incrementally...")
+    closed = df.iloc[:-1]
+    
+    state = load_indicator_state(state_path)
+    if state is None or state.last_time not in closed.index:
+        logging.info("No usable indicator state, replaying full history")
+        new_rows = closed
+        state = _replay_indicators(closed)
     else:
-        reasons['EMA_20'] = "❌ [0分] 价格高于20周EMA"
+        new_rows = closed.loc[closed.index > state.last_time]
+        for _, row in new_rows.iterrows():
+            update_indicators_streaming(state, row)
+    if len(new_rows):
+        save_indicator_state(state, state_path)
+    
+    live_state, _ = update_indicators_streaming(copy.deepcopy(state), df.iloc[-1])
+    times, values = zip(*live_state.recent)
+    indicators = pd.DataFrame(list(values), index=pd.Index(times, name=df.index.name))
+    
+    logging.info(f"Indicators updated ({len(new_rows)} new closed candles)")
+    return df.join(indicators)
+
+
+# ============================================================================
+# SIGNAL SCORING SYSTEM
+# ============================================================================
+
+# Trailing rows handed to the scoring kernels (the widest lookback is the 20-week support/resistance)
+_SCORE_WINDOW = 20
+
+# Kernel arguments, in order; '{bb}' is BB_lower for the bear kernel and BB_upper for the bull kernel
+_SCORE_COLUMNS = ('c', 'h', 'l', 'EMA_20', 'EMA_50', 'EMA_200', 'RSI_14',
+                  'MACD', 'MACD_signal', '{bb}', 'v', 'Volume_MA', 'OBV')
+
+# Rule key and reason texts per scoring rule, in kernel flag order.
+# A flag is the index of the text that applies, or -1 when the rule was skipped for missing data.
+_BEAR_RULES = (
+    ('EMA_20', ("❌ [0分] 价格高于20周EMA", "🟡 [10分] 价格低于20周EMA（仅1周）", "✅ [20分] 价格连续2周低于20周EMA")),
+    ('EMA_50', ("❌ [0分] 价格高于50周EMA", "✅ [10分] 价格低于50周EMA")),
+    ('Death_Cross', ("❌ [0分] 无死亡交叉", "✅ [10分] 死亡交叉（50EMA < 200EMA）")),
+    ('Lower_Low', ("❌ [0分] 未创新低", "✅ [10分] 创新低 (${low:,.0f} < ${prev_low:,.0f})")),
+    ('Support', ("❌ [0分] 未跌破关键支撑", "✅ [8分] 跌破关键支撑 (${support:,.0f})")),
+    ('BB_Breakdown', ("❌ [0分] 未跌破布林带下轨", "✅ [7分] 跌破布林带下轨")),
+    ('RSI', ("❌ [0分] RSI中性 ({rsi:.1f})", "🟡 [4分] RSI超卖 ({rsi:.1f})", "✅ [8分] RSI从超买回落 (当前:{rsi:.1f})")),
+    ('MACD', ("❌ [0分] MACD正向", "🟡 [3分] MACD负值", "✅ [7分] MACD死叉")),
+    ('Divergence', ("❌ [0分] 无背离", "✅ [5分] 检测到熊背离")),
+    ('Volume', ("❌ [0分] 下跌缩量", "🟡 [2分] 成交量放大但价格未下跌", "✅ [5分] 下跌放量")),
+    ('OBV', ("❌ [0分] OBV上升", "✅ [5分] OBV下降")),
+)
+_BEAR_VALUES = ('low', 'prev_low', 'support', 'rsi')
+
+# Most the optional chain-data confirmation can add on top of the kernel score
+_CHAIN_MAX_POINTS = 5
+
+# Flag of the rules a kernel stopped before evaluating (score can no longer reach min_score)
+_NOT_EVALUATED = -2
+
+# Score steps as (flag index, level reached, points): a rule at level L earns every step up to L,
+# so the score is one dot product of the reached-step mask with the points column
+_BEAR_STEPS = np.array([
+    (0, 1, 10), (0, 2, 10), (1, 1, 10), (2, 1, 10), (3, 1, 10), (4, 1, 8), (5, 1, 7),
+    (6, 1, 4), (6, 2, 4), (7, 1, 3), (7, 2, 4), (8, 1, 5), (9, 1, 2), (9, 2, 3), (10, 1, 5),
+], dtype=np.int64)
+
+_BULL_RULES = (
+    ('EMA_20', ("❌ [0分] 价格低于20周EMA", "🟡 [6分] 价格高于20周EMA（仅1周）",
+                "🟡 [12分] 价格连续2周高于20周EMA", "✅ [20分] 价格连续3周高于20周EMA")),
+    ('EMA_50', ("❌ [0分] 价格低于50周EMA", "✅ [10分] 价格高于50周EMA")),
+    ('Golden_Cross', ("❌ [0分] 无黄金交叉", "✅ [10分] 黄金交叉（50EMA > 200EMA）")),
+    ('Higher_High', ("❌ [0分] 未创新高", "✅ [10分] 创新高 (${high:,.0f} > ${prev_high:,.0f})")),
+    ('Resistance', ("❌ [0分] 未突破关键阻力", "✅ [8分] 突破关键阻力 (${resistance:,.0f})")),
+    ('BB_Breakout', ("❌ [0分] 未突破布林带上轨", "✅ [7分] 突破布林带上轨")),
+    ('RSI', ("❌ [0分] RSI中性 ({rsi:.1f})", "🟡 [4分] RSI超买 ({rsi:.1f})", "✅ [8分] RSI从超卖反弹 (当前:{rsi:.1f})")),
+    ('MACD', ("❌ [0分] MACD负向", "🟡 [3分] MACD正值", "✅ [7分] MACD金叉")),
+    ('Divergence', ("❌ [0分] 无背离", "✅ [5分] 检测到牛背离")),
+    ('Volume', ("❌ [0分] 上涨缩量", "🟡 [2分] 成交量放大但价格未上涨", "✅ [5分] 上涨放量")),
+    ('OBV', ("❌ [0分] OBV下降", "✅ [5分] OBV上升")),
+)
+_BULL_VALUES = ('high', 'prev_high', 'resistance', 'rsi')
+
+_BULL_STEPS = np.array([
+    (0, 1, 6), (0, 2, 6), (0, 3, 8), (1, 1, 10), (2, 1, 10), (3, 1, 10), (4, 1, 8), (5, 1, 7),
+    (6, 1, 4), (6, 2, 4), (7, 1, 3), (7, 2, 4), (8, 1, 5), (9, 1, 2), (9, 2, 3), (10, 1, 5),
+], dtype=np.int64)
+
+
+@njit(_SCORE_SIG, cache=True)
+def _score_bear_kernel(close, high, low, ema20, ema50, ema200, rsi, macd, macd_sig, bb_lower, vol, vol_ma, obv, min_score):
+    """
+    Bear scoring over the trailing window of price/indicator arrays
+    
+    Branchless: every rule is a 0/1 comparison multiplied by its points. A rule guarded by
+    `valid` (x == x is False only for NaN) gets flag -1 when its inputs are missing.
+    
+    Rules are evaluated in stages; once even full marks on the remaining stages can't lift
+    the score to min_score, the kernel stops and flags the unevaluated rules _NOT_EVALUATED.
+    
+    Returns:
+        Tuple of (score, flags, values): flags index into _BEAR_RULES texts,
+        values are the numbers quoted in them (see _BEAR_VALUES)
+    """
+    n = close.shape[0]
+    flags = np.full(11, -1, dtype=np.int64)
+    
+    # Scrub NaN from the lookback windows once: -inf never wins a max, +inf never wins a min.
+    # An all-NaN window gives ±inf, which fails the comparisons below just as NaN does.
+    rsi_10, high_10, low_20 = rsi[-10:], high[-10:], low[-20:]
+    rsi_peak = np.max(np.where(rsi_10 == rsi_10, rsi_10, -np.inf))
+    high_peak = np.max(np.where(high_10 == high_10, high_10, -np.inf))
+    support = np.min(np.where(low_20 == low_20, low_20, np.inf))
+    support = support if support < np.inf else np.nan
+    values = np.array([low[-1], low[-2], support, rsi[-1]])
+    
+    # === PRIMARY CONDITIONS (40 points) ===
+    
+    # Price below 20-week EMA (20 points, 10 if only this week)
+    below_now = close[-1] < ema20[-1]
+    below_prev = close[-2] < ema20[-2]
+    flags[0] = below_now * (1 + below_prev)
     
     # Price below 50-week EMA (10 points)
-    if pd.notna(latest['EMA_50']) and latest['c'] < latest['EMA_50']:
-        score += 10
-        reasons['EMA_50'] = "✅ [10分] 价格低于50周EMA"
-    else:
-        reasons['EMA_50'] = "❌ [0分] 价格高于50周EMA"
+    flags[1] = close[-1] < ema50[-1]
     
     # Death Cross: 50 EMA < 200 EMA (10 points)
-    if pd.notna(latest['EMA_50']) and pd.notna(latest['EMA_200']):
-        if latest['EMA_50'] < latest['EMA_200']:
-            score += 10
-            reasons['Death_Cross'] = "✅ [10分] 死亡交叉（50EMA < 200EMA）"
-        else:
-            reasons['Death_Cross'] = "❌ [0分] 无死亡交叉"
+    valid = (ema50[-1] == ema50[-1]) & (ema200[-1] == ema200[-1])
+    death_cross = ema50[-1] < ema200[-1]
+    flags[2] = valid * (death_cross + 1) - 1
     
     # === PRICE ACTION CONFIRMATION (25 points) ===
     
     # Lower Low (10 points)
-    if latest['l'] < prev1['l']:
-        score += 10
-        reasons['Lower_Low'] = f"✅ [10分] 创新低 (${latest['l']:,.0f} < ${prev1['l']:,.0f})"
-    else:
-        reasons['Lower_Low'] = "❌ [0分] 未创新低"
+    flags[3] = low[-1] < low[-2]
     
-    # Breaking support (8 points) - using recent lows
-    recent_support = df['l'].tail(20).min()
-    if latest['c'] < recent_support * 0.98:  # 2% below support
-        score += 8
-        reasons['Support'] = f"✅ [8分] 跌破关键支撑 (${recent_support:,.0f})"
-    else:
-        reasons['Support'] = "❌ [0分] 未跌破关键支撑"
+    # Breaking support (8 points) - 2% below the recent 20-week low
+    flags[4] = close[-1] < support * 0.98
     
     # Bollinger Band breakdown (7 points)
-    if pd.notna(latest['BB_lower']) and latest['c'] < latest['BB_lower']:
-        score += 7
-        reasons['BB_Breakdown'] = "✅ [7分] 跌破布林带下轨"
-    else:
-        reasons['BB_Breakdown'] = "❌ [0分] 未跌破布林带下轨"
+    flags[5] = close[-1] < bb_lower[-1]
+    
+    # Gate: the remaining stages are worth at most 30 points
+    score = np.sum((flags[_BEAR_STEPS[:, 0]] >= _BEAR_STEPS[:, 1]) * _BEAR_STEPS[:, 2])
+    if score + 30 < min_score:
+        flags[6:] = _NOT_EVALUATED
+        return score, flags, values
     
     # === MOMENTUM CONFIRMATION (20 points) ===
     
-    # RSI from overbought (8 points)
-    if pd.notna(latest['RSI_14']) and pd.notna(prev1['RSI_14']):
-        rsi_was_overbought = df['RSI_14'].tail(10).max() > 70
-        if rsi_was_overbought and latest['RSI_14'] < prev1['RSI_14']:
-            score += 8
-            reasons['RSI'] = f"✅ [8分] RSI从超买回落 (当前:{latest['RSI_14']:.1f})"
-        elif latest['RSI_14'] < 30:
-            score += 4
-            reasons['RSI'] = f"🟡 [4分] RSI超卖 ({latest['RSI_14']:.1f})"
-        else:
-            reasons['RSI'] = f"❌ [0分] RSI中性 ({latest['RSI_14']:.1f})"
-    
-    # MACD Death Cross (7 points)
-    if all(pd.notna(x) for x in [latest.get('MACD'), latest.get('MACD_signal'), 
-                                   prev1.get('MACD'), prev1.get('MACD_signal')]):
-        if latest['MACD'] < latest['MACD_signal'] and prev1['MACD'] >= prev1['MACD_signal']:
-            score += 7
-            reasons['MACD'] = "✅ [7分] MACD死叉"
-        elif latest['MACD'] < latest['MACD_signal']:
-            score += 3
-            reasons['MACD'] = "🟡 [3分] MACD负值"
-        else:
-            reasons['MACD'] = "❌ [0分] MACD正向"
-    
-    # Bearish divergence (5 points) - price higher high but RSI lower high
-    if len(df) >= 10:
-        recent_price_high = df['h'].tail(10).max()
-        recent_rsi_high = df['RSI_14'].tail(10).max()
-        if latest['h'] >= recent_price_high * 0.98 and latest['RSI_14'] < recent_rsi_high * 0.95:
-            score += 5
-            reasons['Divergence'] = "✅ [5分] 检测到熊背离"
-        else:
-            reasons['Divergence'] = "❌ [0分] 无背离"
+    # RSI from overbought (8 points), or already oversold (4 points)
+    valid_rsi = (rsi[-1] == rsi[-1]) & (rsi[-2] == rsi[-2])
+    rsi_falling = (rsi_peak > 70) & (rsi[-1] < rsi[-2])
+    rsi_oversold = (1 - rsi_falling) * (rsi[-1] < 30)
+    flags[6] = valid_rsi * (2 * rsi_falling + rsi_oversold + 1) - 1
+    
+    # MACD Death Cross (7 points), or below signal (3 points)
+    valid_macd = (macd[-1] == macd[-1]) & (macd_sig[-1] == macd_sig[-1]) & \
+                 (macd[-2] == macd[-2]) & (macd_sig[-2] == macd_sig[-2])
+    macd_below = macd[-1] < macd_sig[-1]
+    macd_cross = macd_below & (macd[-2] >= macd_sig[-2])
+    flags[7] = valid_macd * (1 + macd_below + macd_cross) - 1
+    
+    # Bearish divergence (5 points) - price near its high but RSI lower high
+    divergence = (high[-1] >= high_peak * 0.98) & (rsi[-1] < rsi_peak * 0.95)
+    flags[8] = (n >= 10) * (divergence + 1) - 1
+    
+    # Gate: the remaining stages are worth at most 10 points
+    score = np.sum((flags[_BEAR_STEPS[:, 0]] >= _BEAR_STEPS[:, 1]) * _BEAR_STEPS[:, 2])
+    if score + 10 < min_score:
+        flags[9:] = _NOT_EVALUATED
+        return score, flags, values
     
     # === VOLUME CONFIRMATION (10 points) ===
     
-    # Declining with volume (5 points)
-    if pd.notna(latest.get('Volume_MA')) and latest['v'] > latest['Volume_MA']:
-        if latest['c'] < prev1['c']:
-            score += 5
-            reasons['Volume'] = "✅ [5分] 下跌放量"
-        else:
-            reasons['Volume'] = "🟡 [2分] 成交量放大但价格未下跌"
-            score += 2
-    else:
-        reasons['Volume'] = "❌ [0分] 下跌缩量"
+    # Declining with volume (5 points, 2 if not declining)
+    high_volume = vol[-1] > vol_ma[-1]
+    flags[9] = high_volume * (1 + (close[-1] < close[-2]))
     
     # OBV declining (5 points)
-    if pd.notna(latest.get('OBV')) and pd.notna(prev1.get('OBV')):
-        if latest['OBV'] < prev1['OBV']:
-            score += 5
-            reasons['OBV'] = "✅ [5分] OBV下降"
-        else:
-            reasons['OBV'] = "❌ [0分] OBV上升"
+    valid_obv = (obv[-1] == obv[-1]) & (obv[-2] == obv[-2])
+    flags[10] = valid_obv * ((obv[-1] < obv[-2]) + 1) - 1
     
-    # === CHAIN DATA CONFIRMATION (5 points, optional) ===
-    if chain_data:
-        # MVRV Z-Score > 5.0 and declining (3 points)
-        mvrv = chain_data.get('mvrv_z_score')
-        if mvrv and mvrv > 5.0:
-            score += 3
-            reasons['MVRV'] = f"✅ [3分] MVRV过热 ({mvrv:.2f})"
-        else:
-            reasons['MVRV'] = f"❌ [0分] MVRV正常 ({mvrv:.2f if mvrv else 'N/A'})"
-        
-        # aSOPR < 1.0 (2 points)
-        sopr = chain_data.get('sopr')
-        if sopr and sopr < 1.0:
-            score += 2
-            reasons['SOPR'] = f"✅ [2分] aSOPR<1.0 ({sopr:.3f})"
-        else:
-            reasons['SOPR'] = f"❌ [0分] aSOPR>=1.0 ({sopr:.3f if sopr else 'N/A'})"
-    else:
-        reasons['Chain_Data'] = "ℹ️ [0分] 链上数据不可用"
-    
-    return score, reasons
+    # Reached-step mask dotted with the step points; skipped rules (-1) reach no step
+    reached = flags[_BEAR_STEPS[:, 0]] >= _BEAR_STEPS[:, 1]
+    score = np.sum(reached * _BEAR_STEPS[:, 2])
+    return score, flags, values
 
 
-def calculate_bull_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = None) -> Tuple[int, Dict[str, str]]:
+@njit(_SCORE_SIG, cache=True)
+def _score_bull_kernel(close, high, low, ema20, ema50, ema200, rsi, macd, macd_sig, bb_upper, vol, vol_ma, obv, min_score):
     """
-    Calculate bull signal score (0-100)
+    Bull scoring over the trailing window of price/indicator arrays
+    
+    Branchless and staged, like _score_bear_kernel.
     
-    Args:
-        df: DataFrame with price and indicator data
-        chain_data: Optional dictionary with chain data
-        
     Returns:
-        Tuple of (score, reasons_dict)
+        Tuple of (score, flags, values): flags index into _BULL_RULES texts,
+        values are the numbers quoted in them (see _BULL_VALUES)
     """
-    score = 0
-    reasons = {}
-    
-    latest = df.iloc[-1]
-    prev1 = df.iloc[-2]
-    prev2 = df.iloc[-3] if len(df) >= 3 else prev1
+    n = close.shape[0]
+    flags = np.full(11, -1, dtype=np.int64)
+    i2 = -3 if n >= 3 else -2
+    
+    # NaN-scrubbed lookback extremes, as in _score_bear_kernel
+    rsi_10, low_10, high_20 = rsi[-10:], low[-10:], high[-20:]
+    rsi_floor = np.min(np.where(rsi_10 == rsi_10, rsi_10, np.inf))
+    low_floor = np.min(np.where(low_10 == low_10, low_10, np.inf))
+    resistance = np.max(np.where(high_20 == high_20, high_20, -np.inf))
+    resistance = resistance if resistance > -np.inf else np.nan
+    values = np.array([high[-1], high[-2], resistance, rsi[-1]])
     
     # === PRIMARY CONDITIONS (40 points) ===
     
-    # Price above 20-week EMA for 3 weeks (20 points)
-    if all(pd.notna(x.get('EMA_20')) for x in [latest, prev1, prev2]):
-        weeks_above = sum([
-            latest['c'] > latest['EMA_20'],
-            prev1['c'] > prev1['EMA_20'],
-            prev2['c'] > prev2['EMA_20']
-        ])
-        if weeks_above >= 3:
-            score += 20
-            reasons['EMA_20'] = "✅ [20分] 价格连续3周高于20周EMA"
-        elif weeks_above == 2:
-            score += 12
-            reasons['EMA_20'] = "🟡 [12分] 价格连续2周高于20周EMA"
-        elif weeks_above == 1:
-            score += 6
-            reasons['EMA_20'] = "🟡 [6分] 价格高于20周EMA（仅1周）"
-        else:
-            reasons['EMA_20'] = "❌ [0分] 价格低于20周EMA"
+    # Price above 20-week EMA for 3 weeks (20 points; 12 for 2 weeks, 6 for 1)
+    valid = (ema20[-1] == ema20[-1]) & (ema20[-2] == ema20[-2]) & (ema20[i2] == ema20[i2])
+    weeks_above = int(close[-1] > ema20[-1]) + int(close[-2] > ema20[-2]) + int(close[i2] > ema20[i2])
+    flags[0] = valid * (weeks_above + 1) - 1
     
     # Price above 50-week EMA (10 points)
-    if pd.notna(latest['EMA_50']) and latest['c'] > latest['EMA_50']:
-        score += 10
-        reasons['EMA_50'] = "✅ [10分] 价格高于50周EMA"
-    else:
-        reasons['EMA_50'] = "❌ [0分] 价格低于50周EMA"
+    flags[1] = close[-1] > ema50[-1]
     
     # Golden Cross: 50 EMA > 200 EMA (10 points)
-    if pd.notna(latest['EMA_50']) and pd.notna(latest['EMA_200']):
-        if latest['EMA_50'] > latest['EMA_200']:
-            score += 10
-            reasons['Golden_Cross'] = "✅ [10分] 黄金交叉（50EMA > 200EMA）"
-        else:
-            reasons['Golden_Cross'] = "❌ [0分] 无黄金交叉"
+    valid = (ema50[-1] == ema50[-1]) & (ema200[-1] == ema200[-1])
+    golden_cross = ema50[-1] > ema200[-1]
+    flags[2] = valid * (golden_cross + 1) - 1
     
     # === PRICE ACTION CONFIRMATION (25 points) ===
     
     # Higher High (10 points)
-    if latest['h'] > prev1['h']:
-        score += 10
-        reasons['Higher_High'] = f"✅ [10分] 创新高 (${latest['h']:,.0f} > ${prev1['h']:,.0f})"
-    else:
-        reasons['Higher_High'] = "❌ [0分] 未创新高"
+    flags[3] = high[-1] > high[-2]
     
-    # Breaking resistance (8 points)
-    recent_resistance = df['h'].tail(20).max()
-    if latest['c'] > recent_resistance * 1.02:  # 2% above resistance
-        score += 8
-        reasons['Resistance'] = f"✅ [8分] 突破关键阻力 (${recent_resistance:,.0f})"
-    else:
-        reasons['Resistance'] = "❌ [0分] 未突破关键阻力"
+    # Breaking resistance (8 points) - 2% above the recent 20-week high
+    flags[4] = close[-1] > resistance * 1.02
     
     # Bollinger Band breakout (7 points)
-    if pd.notna(latest['BB_upper']) and latest['c'] > latest['BB_upper']:
-        score += 7
-        reasons['BB_Breakout'] = "✅ [7分] 突破布林带上轨"
-    else:
-        reasons['BB_Breakout'] = "❌ [0分] 未突破布林带上轨"
+    flags[5] = close[-1] > bb_upper[-1]
+    
+    # Gate: the remaining stages are worth at most 30 points
+    score = np.sum((flags[_BULL_STEPS[:, 0]] >= _BULL_STEPS[:, 1]) * _BULL_STEPS[:, 2])
+    if score + 30 < min_score:
+        flags[6:] = _NOT_EVALUATED
+        return score, flags, values
     
     # === MOMENTUM CONFIRMATION (20 points) ===
     
-    # RSI from oversold (8 points)
-    if pd.notna(latest['RSI_14']) and pd.notna(prev1['RSI_14']):
-        rsi_was_oversold = df['RSI_14'].tail(10).min() < 30
-        if rsi_was_oversold and latest['RSI_14'] > prev1['RSI_14']:
-            score += 8
-            reasons['RSI'] = f"✅ [8分] RSI从超卖反弹 (当前:{latest['RSI_14']:.1f})"
-        elif latest['RSI_14'] > 70:
-            score += 4
-            reasons['RSI'] = f"🟡 [4分] RSI超买 ({latest['RSI_14']:.1f})"
-        else:
-            reasons['RSI'] = f"❌ [0分] RSI中性 ({latest['RSI_14']:.1f})"
-    
-    # MACD Golden Cross (7 points)
-    if all(pd.notna(x) for x in [latest.get('MACD'), latest.get('MACD_signal'),
-                                   prev1.get('MACD'), prev1.get('MACD_signal')]):
-        if latest['MACD'] > latest['MACD_signal'] and prev1['MACD'] <= prev1['MACD_signal']:
-            score += 7
-            reasons['MACD'] = "✅ [7分] MACD金叉"
-        elif latest['MACD'] > latest['MACD_signal']:
-            score += 3
-            reasons['MACD'] = "🟡 [3分] MACD正值"
-        else:
-            reasons['MACD'] = "❌ [0分] MACD负向"
-    
-    # Bullish divergence (5 points)
-    if len(df) >= 10:
-        recent_price_low = df['l'].tail(10).min()
-        recent_rsi_low = df['RSI_14'].tail(10).min()
-        if latest['l'] <= recent_price_low * 1.02 and latest['RSI_14'] > recent_rsi_low * 1.05:
-            score += 5
-            reasons['Divergence'] = "✅ [5分] 检测到牛背离"
-        else:
-            reasons['Divergence'] = "❌ [0分] 无背离"
+    # RSI from oversold (8 points), or already overbought (4 points)
+    valid_rsi = (rsi[-1] == rsi[-1]) & (rsi[-2] == rsi[-2])
+    rsi_rising = (rsi_floor < 30) & (rsi[-1] > rsi[-2])
+    rsi_overbought = (1 - rsi_rising) * (rsi[-1] > 70)
+    flags[6] = valid_rsi * (2 * rsi_rising + rsi_overbought + 1) - 1
+    
+    # MACD Golden Cross (7 points), or above signal (3 points)
+    valid_macd = (macd[-1] == macd[-1]) & (macd_sig[-1] == macd_sig[-1]) & \
+                 (macd[-2] == macd[-2]) & (macd_sig[-2] == macd_sig[-2])
+    macd_above = macd[-1] > macd_sig[-1]
+    macd_cross = macd_above & (macd[-2] <= macd_sig[-2])
+    flags[7] = valid_macd * (1 + macd_above + macd_cross) - 1
+    
+    # Bullish divergence (5 points) - price near its low but RSI higher low
+    divergence = (low[-1] <= low_floor * 1.02) & (rsi[-1] > rsi_floor * 1.05)
+    flags[8] = (n >= 10) * (divergence + 1) - 1
+    
+    # Gate: the remaining stages are worth at most 10 points
+    score = np.sum((flags[_BULL_STEPS[:, 0]] >= _BULL_STEPS[:, 1]) * _BULL_STEPS[:, 2])
+    if score + 10 < min_score:
+        flags[9:] = _NOT_EVALUATED
+        return score, flags, values
     
     # === VOLUME CONFIRMATION (10 points) ===
     
-    # Rising with volume (5 points)
-    if pd.notna(latest.get('Volume_MA')) and latest['v'] > latest['Volume_MA']:
-        if latest['c'] > prev1['c']:
-            score += 5
-            reasons['Volume'] = "✅ [5分] 上涨放量"
+    # Rising with volume (5 points, 2 if not rising)
+    high_volume = vol[-1] > vol_ma[-1]
+    flags[9] = high_volume * (1 + (close[-1] > close[-2]))
+    
+    # OBV rising (5 points)
+    valid_obv = (obv[-1] == obv[-1]) & (obv[-2] == obv[-2])
+    flags[10] = valid_obv * ((obv[-1] > obv[-2]) + 1) - 1
+    
+    # Reached-step mask dotted with the step points; skipped rules (-1) reach no step
+    reached = flags[_BULL_STEPS[:, 0]] >= _BULL_STEPS[:, 1]
+    score = np.sum(reached * _BULL_STEPS[:, 2])
+    return score, flags, values
+
+
+def _score_inputs(df: pd.DataFrame, bb_column: str) -> np.ndarray:
+    """
+    Pack the trailing scoring window into one contiguous float64 array per kernel argument
+    
+    Missing indicator columns become all-NaN rows so the kernels skip those rules.
+    """
+    columns = [bb_column if col == '{bb}' else col for col in _SCORE_COLUMNS]
+    block = df.reindex(columns=columns).iloc[-_SCORE_WINDOW:].to_numpy(dtype=np.float64)
+    return np.ascontiguousarray(block.T)
+
+
+def warmup_kernels() -> None:
+    """Run every kernel once on a tiny dummy window so the first real check starts hot"""
+    dummy = np.linspace(1.0, 2.0, _SCORE_WINDOW)
+    _compute_all_indicators(dummy, dummy, dummy, dummy)
+    _score_bear_kernel(*(dummy,) * 13, 0)
+    _score_bull_kernel(*(dummy,) * 13, 0)
+
+
+def _format_reasons(rules: tuple, flags: np.ndarray, values: Dict[str, float]) -> Dict[str, str]:
+    """Turn kernel flags into the reasons dict, skipping rules that were not scored (negative flags)"""
+    return {key: texts[flag].format(**values) for (key, texts), flag in zip(rules, flags) if flag >= 0}
+
+
+def _not_evaluated_reason(rules: tuple, flags: np.ndarray, min_score: int) -> Optional[str]:
+    """Reason listing the rules a kernel stopped before, or None if every rule was evaluated"""
+    skipped = [key for (key, _), flag in zip(rules, flags) if flag == _NOT_EVALUATED]
+    if not skipped:
+        return None
+    return f"⏸️ [未评估] {', '.join(skipped)}：总分已无法达到{min_score}分，已跳过"
+
+
+def _format_metric(value: Optional[float], spec: str) -> str:
+    """Format an optional chain metric, 'N/A' when it is missing (None or NaN)"""
+    return 'N/A' if value is None or value != value else format(value, spec)
+
+
+def calculate_bear_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = None,
+                               min_score: int = 0) -> Tuple[int, Dict[str, str]]:
+    """
+    Calculate bear signal score (0-100)
+    
+    Args:
+        df: DataFrame with price and indicator data
+        chain_data: Optional dictionary with chain data (MVRV, aSOPR)
+        min_score: Stop evaluating rules once the score provably can't reach this; the
+            returned score is then a lower bound and reasons gets a 'Not_Evaluated' entry
+            naming the skipped rules
+        
+    Returns:
+        Tuple of (score, reasons)
+    """
+    chain_headroom = _CHAIN_MAX_POINTS if chain_data else 0
+    score, flags, values = _score_bear_kernel(*_score_inputs(df, 'BB_lower'), min_score - chain_headroom)
+    score = int(score)
+    reasons = _format_reasons(_BEAR_RULES, flags, dict(zip(_BEAR_VALUES, values)))
+    not_evaluated = _not_evaluated_reason(_BEAR_RULES, flags, min_score)
+    if not_evaluated:
+        reasons['Not_Evaluated'] = not_evaluated
+    
+    # === CHAIN DATA CONFIRMATION (5 points, optional) ===
+    if chain_data:
+        # MVRV Z-Score > 5.0 and declining (3 points)
+        mvrv = chain_data.get('mvrv_z_score')
+        if mvrv and mvrv > 5.0:
+            score += 3
+            reasons['MVRV'] = f"✅ [3分] MVRV过热 ({mvrv:.2f})"
         else:
-            reasons['Volume'] = "🟡 [2分] 成交量放大但价格未上涨"
+            reasons['MVRV'] = f"❌ [0分] MVRV正常 ({_format_metric(mvrv, '.2f')})"
+        
+        # aSOPR < 1.0 (2 points)
+        sopr = chain_data.get('sopr')
+        if sopr and sopr < 1.0:
             score += 2
+            reasons['SOPR'] = f"✅ [2分] aSOPR<1.0 ({sopr:.3f})"
+        else:
+            reasons['SOPR'] = f"❌ [0分] aSOPR>=1.0 ({_format_metric(sopr, '.3f')})"
     else:
-        reasons['Volume'] = "❌ [0分] 上涨缩量"
+        reasons['Chain_Data'] = "ℹ️ [0分] 链上数据不可用"
     
-    # OBV rising (5 points)
-    if pd.notna(latest.get('OBV')) and pd.notna(prev1.get('OBV')):
-        if latest['OBV'] > prev1['OBV']:
-            score += 5
-            reasons['OBV'] = "✅ [5分] OBV上升"
-        else:
-            reasons['OBV'] = "❌ [0分] OBV下降"
+    return score, reasons
+
+
+def calculate_bull_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = None,
+                               min_score: int = 0) -> Tuple[int, Dict[str, str]]:
+    """
+    Calculate bull signal score (0-100)
+    
+    Args:
+        df: DataFrame with price and indicator data
+        chain_data: Optional dictionary with chain data
+        min_score: Early-exit threshold, as in calculate_bear_signal_score
+        
+    Returns:
+        Tuple of (score, reasons)
+    """
+    chain_headroom = _CHAIN_MAX_POINTS if chain_data else 0
+    score, flags, values = _score_bull_kernel(*_score_inputs(df, 'BB_upper'), min_score - chain_headroom)
+    score = int(score)
+    reasons = _format_reasons(_BULL_RULES, flags, dict(zip(_BULL_VALUES, values)))
+    not_evaluated = _not_evaluated_reason(_BULL_RULES, flags, min_score)
+    if not_evaluated:
+        reasons['Not_Evaluated'] = not_evaluated
     
     # === CHAIN DATA CONFIRMATION (5 points, optional) ===
     if chain_data:
@@ -526,7 +1186,7 @@ def calculate_bull_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = N
             score += 3
             reasons['MVRV'] = f"✅ [3分] MVRV健康区间 ({mvrv:.2f})"
         else:
-            reasons['MVRV'] = f"❌ [0分] MVRV非健康区间 ({mvrv:.2f if mvrv else 'N/A'})"
+            reasons['MVRV'] = f"❌ [0分] MVRV非健康区间 ({_format_metric(mvrv, '.2f')})"
         
         # aSOPR > 1.0 (2 points)
         sopr = chain_data.get('sopr')
@@ -534,7 +1194,7 @@ def calculate_bull_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = N
             score += 2
             reasons['SOPR'] = f"✅ [2分] aSOPR>1.0 ({sopr:.3f})"
         else:
-            reasons['SOPR'] = f"❌ [0分] aSOPR<=1.0 ({sopr:.3f if sopr else 'N/A'})"
+            reasons['SOPR'] = f"❌ [0分] aSOPR<=1.0 ({_format_metric(sopr, '.3f')})"
     else:
         reasons['Chain_Data'] = "ℹ️ [0分] 链上数据不可用"
     
@@ -545,54 +1205,75 @@ def calculate_bull_signal_score(df: pd.DataFrame, chain_data: Optional[Dict] = N
 # MAIN SIGNAL DETECTION
 # ============================================================================
 
+# Lowest score that is reported as a (cautious) signal
+_MIN_ALERT_SCORE = 50
+
+# Report borders
+_BORDER = "=" * 80
+_BANG_BORDER = "!" * 80
+
+
+def _format_score(score: int, reasons: Dict[str, str]) -> str:
+    """Score line for the report; a score the scorer stopped early on is only a partial sum"""
+    if 'Not_Evaluated' in reasons:
+        return f"未达{_MIN_ALERT_SCORE}分阈值（已评估部分得分 {score}，其余指标未评估）"
+    if score < _MIN_ALERT_SCORE:
+        return f"{score}/100（未达{_MIN_ALERT_SCORE}分阈值）"
+    return f"{score}/100"
+
+
 def check_market_signals():
     """Main function to check market signals"""
-    logging.info(f"\n{'='*80}")
+    logging.info(f"\n{_BORDER}")
     logging.info(f"运行市场信号检测 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logging.info(f"{'='*80}\n")
+    logging.info(f"{_BORDER}\n")
+    
+    # Fetch weekly price data and (optionally) Glassnode chain data concurrently
+    mvrv_df = sopr_df = None
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        week_future = executor.submit(get_price_data, 'BTC/USDT', '1w', 200)
+        if CONFIG_AVAILABLE and GLASSNODE_API_KEY and GLASSNODE_API_KEY != 'YOUR_GLASSNODE_API_KEY':
+            logging.info("尝试获取链上数据...")
+            mvrv_df, sopr_df = fetch_all(CHAIN_DATA_URLS)
+        df_week = week_future.result()
     
-    # Fetch weekly price data
-    df_week = get_price_data('BTC/USDT', '1w', 200)
     if df_week is None or len(df_week) < 50:
         logging.error("无法获取足够的周线数据，终止检测")
         return
     
     # Calculate indicators
-    df_week = calculate_indicators(df_week)
+    df_week = calculate_indicators_streaming(df_week, indicator_state_path('BTC/USDT', '1w'))
     df_week = df_week.dropna(subset=['EMA_20'])
     
-    # Optionally fetch Glassnode chain data
+    # Optional Glassnode chain data
     chain_data = None
-    if CONFIG_AVAILABLE and GLASSNODE_API_KEY and GLASSNODE_API_KEY != 'YOUR_GLASSNODE_API_KEY':
-        logging.info("尝试获取链上数据...")
-        mvrv_df = get_glassnode_data('https://api.glassnode.com/v1/metrics/indicators/mvrv_z_score')
-        sopr_df = get_glassnode_data('https://api.glassnode.com/v1/metrics/indicators/sopr_adjusted')
-        
-        if mvrv_df is not None and sopr_df is not None:
-            latest_mvrv = mvrv_df['value'].iloc[-1] if len(mvrv_df) > 0 else None
-            latest_sopr = sopr_df['value'].iloc[-1] if len(sopr_df) > 0 else None
-            chain_data = {
-                'mvrv_z_score': latest_mvrv,
-                'sopr': latest_sopr
-            }
-            logging.info(f"链上数据: MVRV={latest_mvrv:.2f if latest_mvrv else 'N/A'}, aSOPR={latest_sopr:.3f if latest_sopr else 'N/A'}")
-    
-    # Calculate signal scores
-    bear_score, bear_reasons = calculate_bear_signal_score(df_week, chain_data)
-    bull_score, bull_reasons = calculate_bull_signal_score(df_week, chain_data)
-    
-    # Get latest data
-    latest = df_week.iloc[-1]
-    
-    # Print results
-    print(f"\n{'='*80}")
-    print(f"BTC 市场信号检测结果")
-    print(f"{'='*80}")
-    print(f"当前价格: ${latest['c']:,.2f}")
-    print(f"检测时间: {latest.name.strftime('%Y-%m-%d')}\n")
-    
-    print(f"[熊] 熊市信号评分: {bear_score}/100")
-    print(f"[牛] 牛市信号评分: {bull_score}/100\n")
+    if mvrv_df is not None and sopr_df is not None:
+        latest_mvrv = mvrv_df['value'].to_numpy()[-1] if len(mvrv_df) > 0 else None
+        latest_sopr = sopr_df['value'].to_numpy()[-1] if len(sopr_df) > 0 else None
+        chain_data = {
+            'mvrv_z_score': latest_mvrv,
+            'sopr': latest_sopr
+        }
+        logging.info(f"链上数据: MVRV={_format_metric(latest_mvrv, '.2f')}, aSOPR={_format_metric(latest_sopr, '.3f')}")
+    
+    # Calculate signal scores; a side that can't reach the lowest alert level (50) stops early
+    bear_score, bear_reasons = calculate_bear_signal_score(df_week, chain_data, min_score=_MIN_ALERT_SCORE)
+    bull_score, bull_reasons = calculate_bull_signal_score(df_week, chain_data, min_score=_MIN_ALERT_SCORE)
+    
+    # Latest close and candle time, read positionally instead of materializing a row Series
+    latest_price = df_week['c'].to_numpy()[-1]
+    latest_time = df_week.index[-1]
+    
+    # The report is assembled here and written to stdout in one go at the end
+    report = [
+        f"\n{_BORDER}",
+        "BTC 市场信号检测结果",
+        _BORDER,
+        f"当前价格: ${latest_price:,.2f}",
+        f"检测时间: {latest_time.strftime('%Y-%m-%d')}\n",
+        f"[熊] 熊市信号评分: {_format_score(bear_score, bear_reasons)}",
+        f"[牛] 牛市信号评分: {_format_score(bull_score, bull_reasons)}\n",
+    ]
     
     # Determine signal strength and action
     alert_message = ""
@@ -602,123 +1283,161 @@ def check_market_signals():
     if bear_score >= 90:
         alert_subject = "🚨 强烈看跌信号！牛转熊高度确认"
         priority = "high"
-        alert_message = generate_alert_message("STRONG_BEAR", bear_score, bear_reasons, latest)
+        alert_message = generate_alert_message("STRONG_BEAR", bear_score, bear_reasons, latest_price, latest_time)
     elif bear_score >= 70:
         alert_subject = "🔴 看跌信号！牛转熊确认"
         priority = "medium"
-        alert_message = generate_alert_message("BEAR", bear_score, bear_reasons, latest)
-    elif bear_score >= 50:
+        alert_message = generate_alert_message("BEAR", bear_score, bear_reasons, latest_price, latest_time)
+    elif bear_score >= _MIN_ALERT_SCORE:
         alert_subject = "🟡 谨慎看跌信号"
         priority = "low"
-        print(f"[!] 检测到谨慎看跌信号 ({bear_score}分)，建议观察\n")
+        report.append(f"[!] 检测到谨慎看跌信号 ({bear_score}分)，建议观察\n")
     
     if bull_score >= 90:
         alert_subject = "🎉 强烈看涨信号！熊转牛高度确认"
         priority = "high"
-        alert_message = generate_alert_message("STRONG_BULL", bull_score, bull_reasons, latest)
+        alert_message = generate_alert_message("STRONG_BULL", bull_score, bull_reasons, latest_price, latest_time)
     elif bull_score >= 70:
         alert_subject = "🟢 看涨信号！熊转牛确认"
         priority = "medium"
-        alert_message = generate_alert_message("BULL", bull_score, bull_reasons, latest)
-    elif bull_score >= 50 and not alert_message:
+        alert_message = generate_alert_message("BULL", bull_score, bull_reasons, latest_price, latest_time)
+    elif bull_score >= _MIN_ALERT_SCORE and not alert_message:
         alert_subject = "🟡 谨慎看涨信号"
         priority = "low"
-        print(f"[!] 检测到谨慎看涨信号 ({bull_score}分)，建议观察\n")
-    
-    # Print detailed reasons
-    print(f"{'='*80}")
-    print(f"[熊] 熊市信号详细分析:")
-    print(f"{'='*80}")
-    for key, reason in bear_reasons.items():
-        print(f"  {reason}")
-    
-    print(f"\n{'='*80}")
-    print(f"[牛] 牛市信号详细分析:")
-    print(f"{'='*80}")
-    for key, reason in bull_reasons.items():
-        print(f"  {reason}")
-    print(f"{'='*80}\n")
+        report.append(f"[!] 检测到谨慎看涨信号 ({bull_score}分)，建议观察\n")
+    
+    # Detailed reasons
+    report += [_BORDER, "[熊] 熊市信号详细分析:", _BORDER]
+    report += (f"  {reason}" for reason in bear_reasons.values())
+    report += [f"\n{_BORDER}", "[牛] 牛市信号详细分析:", _BORDER]
+    report += (f"  {reason}" for reason in bull_reasons.values())
+    report.append(f"{_BORDER}\n")
     
-    # Send alerts if significant signal
     if alert_message:
-        print(f"\n{'!'*80}")
-        print(f"!!! {alert_subject} !!!")
-        print(f"{'!'*80}\n")
-        send_telegram_message(alert_message)
-        if priority == "high":
-            send_email_alert(alert_subject, alert_message)
+        report += [f"\n{_BANG_BORDER}", f"!!! {alert_subject} !!!", f"{_BANG_BORDER}\n"]
     else:
-        print("[OK] 当前市场状态中性，继续观察\n")
+        report.append("[OK] 当前市场状态中性，继续观察\n")
+    sys.stdout.write("\n".join(report) + "\n")
+    
+    # Send alerts if significant signal
+    if alert_message:
+        dispatch_alerts(alert_subject, alert_message, send_email=(priority == "high"))
 
 
-def generate_alert_message(signal_type: str, score: int, reasons: Dict, latest_data) -> str:
-    """Generate formatted alert message"""
-    
-    emoji_map = {
-        "STRONG_BEAR": "🚨🔴",
-        "BEAR": "🔴",
-        "STRONG_BULL": "🎉🟢",
-        "BULL": "🟢"
-    }
-    
-    title_map = {
-        "STRONG_BEAR": "强烈看跌信号 - 牛转熊高度确认",
-        "BEAR": "看跌信号 - 牛转熊确认",
-        "STRONG_BULL": "强烈看涨信号 - 熊转牛高度确认",
-        "BULL": "看涨信号 - 熊转牛确认"
-    }
-    
-    recommendation_map = {
-        "STRONG_BEAR": "**强烈建议**: 立即开始战略性减仓，降低风险敞口50-100%",
-        "BEAR": "**建议**: 分批减仓，降低风险敞口25-50%",
-        "STRONG_BULL": "**强烈建议**: 积极建仓或加仓，提升风险敞口50-100%",
-        "BULL": "**建议**: 分批建仓或加仓，提升风险敞口25-50%"
-    }
-    
-    emoji = emoji_map.get(signal_type, "")
-    title = title_map.get(signal_type, "市场信号")
-    recommendation = recommendation_map.get(signal_type, "建议观察")
-    
-    message = f"""{emoji} **{title}** {emoji}
+# Alert presentation per signal type: (emoji, title, recommendation)
+_SIGNAL_META: Final[Dict[str, Tuple[str, str, str]]] = {
+    "STRONG_BEAR": ("🚨🔴", "强烈看跌信号 - 牛转熊高度确认", "<b>强烈建议</b>: 立即开始战略性减仓，降低风险敞口50-100%"),
+    "BEAR": ("🔴", "看跌信号 - 牛转熊确认", "<b>建议</b>: 分批减仓，降低风险敞口25-50%"),
+    "STRONG_BULL": ("🎉🟢", "强烈看涨信号 - 熊转牛高度确认", "<b>强烈建议</b>: 积极建仓或加仓，提升风险敞口50-100%"),
+    "BULL": ("🟢", "看涨信号 - 熊转牛确认", "<b>建议</b>: 分批建仓或加仓，提升风险敞口25-50%"),
+}
+_DEFAULT_SIGNAL_META = ("", "市场信号", "建议观察")
 
-**检测时间**: {latest_data.name.strftime('%Y-%m-%d')}
-**BTC 价格**: ${latest_data['c']:,.2f}
-**信号评分**: {score}/100
 
-**指标详情**:
-"""
+def generate_alert_message(signal_type: str, score: int, reasons: Dict, latest_price: float, latest_time: datetime) -> str:
+    """
+    Generate the alert message for the latest weekly close and candle time
     
-    for key, reason in reasons.items():
-        message += f"{reason}\n"
+    The message is Telegram HTML: unlike Markdown, a stray '_' or '*' in a value can't
+    break parsing, as long as the interpolated text is escaped (the reasons contain '<'/'>').
+    """
     
-    message += f"\n{recommendation}\n"
-    message += f"\n_本信号由增强版市场周期检测系统自动生成_"
+    emoji, title, recommendation = _SIGNAL_META.get(signal_type, _DEFAULT_SIGNAL_META)
+    details = html.escape("\n".join(reasons.values()), quote=False)
     
-    return message
+    return f"""{emoji} <b>{title}</b> {emoji}
+
+<b>检测时间</b>: {html.escape(latest_time.strftime('%Y-%m-%d'))}
+<b>BTC 价格</b>: ${html.escape(f'{latest_price:,.2f}')}
+<b>信号评分</b>: {score}/100
+
+<b>指标详情</b>:
+{details}
+
+{recommendation}
+
+<i>本信号由增强版市场周期检测系统自动生成</i>"""
 
 
 # ============================================================================
 # SCHEDULER
 # ============================================================================
 
+def seconds_until_next_run(weekday: Optional[int] = 0, at: str = "02:00", now: Optional[datetime] = None) -> float:
+    """
+    Seconds from now until the next scheduled run
+    
+    Args:
+        weekday: Day of the week to run on (Monday = 0), or None to run every day
+        at: Local time of day as "HH:MM"
+        now: Reference time (default: datetime.now())
+        
+    Returns:
+        Delay in seconds, always > 0
+    """
+    now = now or datetime.now()
+    hour, minute = map(int, at.split(':'))
+    days_ahead = 0 if weekday is None else (weekday - now.weekday()) % 7
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=days_ahead)
+    if next_run <= now:
+        next_run += timedelta(days=1 if weekday is None else 7)
+    return (next_run - now).total_seconds()
+
+
+# Longest single sleep; the remaining delay is recomputed after each one, so wall-clock
+# changes and suspend/resume are picked up within the hour
+_MAX_SLEEP_SECONDS = 3600
+
+
+async def run_scheduler(job, weekday: Optional[int] = 0, at: str = "02:00",
+                        stop: Optional[asyncio.Event] = None) -> None:
+    """
+    Sleep until each scheduled time and run the job, instead of polling every minute
+    
+    Args:
+        job: Callable to run at each scheduled time
+        weekday: Day of the week to run on (Monday = 0), or None to run every day
+        at: Local time of day as "HH:MM"
+        stop: Event that ends the loop as soon as it is set
+    """
+    stop = stop or asyncio.Event()
+    while not stop.is_set():
+        delay = seconds_until_next_run(weekday, at)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=min(delay, _MAX_SLEEP_SECONDS))
+        except asyncio.TimeoutError:
+            if delay <= _MAX_SLEEP_SECONDS:
+                job()
+
+
+async def serve(job, **schedule_kwargs) -> None:
+    """Run the scheduler until SIGTERM/SIGINT, then return cleanly"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows event loops have no signal handlers; Ctrl+C still interrupts
+    await run_scheduler(job, stop=stop, **schedule_kwargs)
+    logging.info("调度器已停止")
+
+
 if __name__ == "__main__":
     print("启动增强版市场信号监控系统...")
     print("数据源: Binance (免费)")
     print("链上数据: Glassnode (可选)\n")
     
+    # Load/compile the numba kernels up front instead of inside the first check
+    warmup_kernels()
+    
     # Run immediately
     check_market_signals()
     
-    # Schedule weekly checks (Monday 2 AM)
-    schedule.every().monday.at("02:00").do(check_market_signals)
-    
-    # Optional: daily check for more frequent monitoring
-    # schedule.every().day.at("09:00").do(check_market_signals)
-    
     print("\n调度器已启动，等待下次检测...")
     print("下次检测时间: 每周一凌晨2点")
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
-
+    # Schedule weekly checks (Monday 2 AM)
+    # Optional: daily check for more frequent monitoring
+    # asyncio.run(serve(check_market_signals, weekday=None, at="09:00"))
+    asyncio.run(serve(check_market_signals))
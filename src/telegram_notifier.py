@@ -6,39 +6,102 @@ so messages can be dispatched directly from the terminal.
 """
 
 import argparse
+import asyncio
+import functools
 import logging
 import os
 import sys
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from typing import Iterable, Optional, Sequence, Union
 
-import requests
-from dotenv import load_dotenv
-
-
-load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-
+# A chat id, a comma-separated string of them ("123,456"), or a list of them
+ChatIds = Union[str, int, Sequence[Union[str, int]]]
+
+# Optional: httpx lets send_telegram_message_async share one (HTTP/2, if h2 is installed)
+# connection between concurrent sends; without it the async API falls back to threads.
+HTTPX_AVAILABLE = find_spec("httpx") is not None
+_ASYNC_MAX_ATTEMPTS = 3
+
+# Concurrent POSTs per multi-chat send; matches the session's connection pool size
+_BROADCAST_WORKERS = 8
+
+# requests and python-dotenv are imported the first time they are needed rather than at
+# import time, so `--help`, argument errors and importing this module stay cheap.
+_SESSION_LOCK = threading.Lock()
+_SESSION = None
+
+
+def _get_session():
+    """Return the shared HTTP session, creating it on first call."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            class _SendRetry(Retry):
+                # sendMessage is not idempotent: a 5xx or a read timeout may come after Telegram has
+                # delivered the message, so POST is only retried on 429 (honouring Retry-After) and on
+                # connection errors raised before the request went out.
+                def is_retry(self, method, status_code, has_retry_after=False):
+                    if method == "POST" and status_code != 429:
+                        return False
+                    return super().is_retry(method, status_code, has_retry_after)
+
+            # Process-wide session: keeps the TLS connection to api.telegram.org alive between messages.
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=_SendRetry(
+                    total=5,
+                    read=False,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=frozenset({"GET", "POST"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                ),
+            ))
+            _SESSION = session
+    return _SESSION
+
+
+# Credentials from the optional config module, read once at import.
+try:
+    from config import TELEGRAM_BOT_TOKEN as _CONFIG_TOKEN, TELEGRAM_CHAT_ID as _CONFIG_CHAT  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    _CONFIG_TOKEN = _CONFIG_CHAT = None
+
+_CONFIG_VALUES = {
+    "TELEGRAM_BOT_TOKEN": _CONFIG_TOKEN,
+    "TELEGRAM_CHAT_ID": _CONFIG_CHAT,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv() -> None:
+    """Load the .env file into the environment (once)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=4)
 def _get_env(name: str) -> Optional[str]:
-    """Fetch an environment variable and fallback to config module if present."""
-    value = os.getenv(name)
-    if value:
-        return value
+    """Fetch an environment variable and fallback to config module if present (memoized)."""
+    _load_dotenv()
+    return os.getenv(name) or _CONFIG_VALUES.get(name)
 
-    try:
-        from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID  # type: ignore
-    except ImportError:  # pragma: no cover - optional dependency
-        return None
 
-    if name == "TELEGRAM_BOT_TOKEN":
-        return TELEGRAM_BOT_TOKEN
-    if name == "TELEGRAM_CHAT_ID":
-        return TELEGRAM_CHAT_ID
-    return None
-
-
-def resolve_credentials(token: Optional[str] = None, chat_id: Optional[str] = None) -> tuple[str, str]:
+def resolve_credentials(token: Optional[str] = None, chat_id: Optional[ChatIds] = None) -> tuple[str, ChatIds]:
     """Resolve Telegram credentials from overrides, environment, or config."""
     resolved_token = token or _get_env("TELEGRAM_BOT_TOKEN")
     resolved_chat = chat_id or _get_env("TELEGRAM_CHAT_ID")
@@ -54,35 +117,205 @@ def resolve_credentials(token: Optional[str] = None, chat_id: Optional[str] = No
     return resolved_token, resolved_chat
 
 
-def send_telegram_message(message: str, *, token: Optional[str] = None, chat_id: Optional[str] = None, parse_mode: str = "plain", timeout: int = 10) -> None:
-    """Send a Telegram message using the configured bot credentials."""
+def send_telegram_message(message: str, *, token: Optional[str] = None, chat_id: Optional[ChatIds] = None, parse_mode: Optional[str] = None, timeout: int = 10) -> None:
+    """Send a Telegram message using the configured bot credentials.
+
+    ``chat_id`` may name several chats (a list or "123,456"); they are posted to
+    concurrently. ``parse_mode`` is passed through to Telegram ("HTML", "MarkdownV2",
+    ...); leave it as None to send plain text, which Telegram never rejects for its
+    formatting.
+    """
+    url, payloads = _build_request(message, token, chat_id, parse_mode)
+    if len(payloads) == 1:
+        _post(url, payloads[0], timeout)
+    else:
+        _post_all(url, payloads, timeout)
+
+
+def _chat_ids(chat_id: ChatIds) -> list[str]:
+    """Normalize a chat id, comma-separated string or list of them to a list of ids."""
+    if isinstance(chat_id, (str, int)):
+        chat_id = str(chat_id).split(",")
+    return [str(chat).strip() for chat in chat_id if str(chat).strip()]
+
+
+def _build_request(message: str, token: Optional[str], chat_id: Optional[ChatIds], parse_mode: Optional[str]) -> tuple[str, list[dict]]:
+    """Validate the message and build the sendMessage URL and one payload per chat."""
     if not message:
         raise ValueError("Message content must not be empty.")
 
     resolved_token, resolved_chat = resolve_credentials(token=token, chat_id=chat_id)
 
     url = f"https://api.telegram.org/bot{resolved_token}/sendMessage"
+    return url, [_payload(chat, message, parse_mode) for chat in _chat_ids(resolved_chat)]
+
+
+def _payload(chat_id: str, message: str, parse_mode: Optional[str]) -> dict:
+    """Build a sendMessage payload."""
     payload = {
-        "chat_id": resolved_chat,
+        "chat_id": chat_id,
         "text": message,
-        "parse_mode": parse_mode,
     }
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
+    return payload
+
 
-    response = requests.post(url, json=payload, timeout=timeout)
+def _post(url: str, payload: dict, timeout: int) -> None:
+    """POST a sendMessage payload on the shared session, raising on HTTP errors."""
+    response = _get_session().post(url, json=payload, timeout=timeout)
     try:
         response.raise_for_status()
-    except requests.exceptions.HTTPError as exc:
+    except Exception as exc:
         logger.error("Failed to send Telegram message: %s", exc, exc_info=True)
         raise
 
 
+def _post_all(url: str, payloads: list[dict], timeout: int) -> None:
+    """POST payloads concurrently over the session pool; re-raise the first failure once all finish."""
+    with ThreadPoolExecutor(max_workers=min(len(payloads), _BROADCAST_WORKERS)) as executor:
+        futures = [executor.submit(_post, url, payload, timeout) for payload in payloads]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        raise errors[0]
+
+
+class TelegramBroadcaster:
+    """Batch messages to one or more chats and post them concurrently.
+
+    Submitted messages are held for ``window`` seconds, then flushed together; the same
+    text submitted to the same chat within one window is sent only once. With a single
+    chat and no duplicates this behaves like calling `send_telegram_message` directly,
+    just ``window`` later. Use as a context manager (or call `close`) so pending
+    messages are flushed on exit.
+    """
+
+    def __init__(self, *, token: Optional[str] = None, chat_id: Optional[ChatIds] = None, parse_mode: Optional[str] = None, timeout: int = 10, window: float = 0.2) -> None:
+        self._token, self._chat_id = resolve_credentials(token=token, chat_id=chat_id)
+        self._url = f"https://api.telegram.org/bot{self._token}/sendMessage"
+        self._parse_mode = parse_mode
+        self._timeout = timeout
+        self._window = window
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[tuple[str, str], dict]" = OrderedDict()
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, message: str, chat_id: Optional[ChatIds] = None) -> None:
+        """Queue ``message`` for the broadcaster's chats (or ``chat_id``) in the current window."""
+        if not message:
+            raise ValueError("Message content must not be empty.")
+
+        with self._lock:
+            for chat in _chat_ids(chat_id or self._chat_id):
+                self._pending.setdefault((chat, message), _payload(chat, message, self._parse_mode))
+            if self._timer is None:
+                self._timer = threading.Timer(self._window, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Send everything queued so far; re-raises the first failure once all sends finish."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            payloads = list(self._pending.values())
+            self._pending.clear()
+        if payloads:
+            _post_all(self._url, payloads, self._timeout)
+
+    def _flush_in_background(self) -> None:
+        """Timer callback: flush, logging failures since there is no caller to raise to."""
+        try:
+            self.flush()
+        except Exception as exc:
+            logger.error("Failed to flush Telegram broadcast: %s", exc)
+
+    def close(self) -> None:
+        """Flush pending messages."""
+        self.flush()
+
+    def __enter__(self) -> "TelegramBroadcaster":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _async_client():
+    """Create an httpx.AsyncClient for a batch of sends."""
+    import httpx
+
+    return httpx.AsyncClient(http2=find_spec("h2") is not None, limits=httpx.Limits(max_keepalive_connections=4))
+
+
+async def send_telegram_message_async(message: str, *, token: Optional[str] = None, chat_id: Optional[ChatIds] = None, parse_mode: Optional[str] = None, timeout: int = 10, client=None) -> None:
+    """Async variant of `send_telegram_message`.
+
+    With httpx installed the message is posted on ``client`` (an ``httpx.AsyncClient``;
+    a temporary one is opened when omitted) and a 429 is retried after the
+    ``retry_after`` Telegram asks for. Without httpx the sync sender runs in a thread.
+    """
+    if not HTTPX_AVAILABLE:
+        await asyncio.to_thread(send_telegram_message, message, token=token, chat_id=chat_id, parse_mode=parse_mode, timeout=timeout)
+        return
+
+    url, payloads = _build_request(message, token, chat_id, parse_mode)
+    if client is None:
+        async with _async_client() as own_client:
+            await asyncio.gather(*(_post_async(own_client, url, payload, timeout) for payload in payloads))
+    else:
+        await asyncio.gather(*(_post_async(client, url, payload, timeout) for payload in payloads))
+
+
+async def _post_async(client, url: str, payload: dict, timeout: int) -> None:
+    """POST a sendMessage payload, waiting out 429 responses up to _ASYNC_MAX_ATTEMPTS times."""
+    for attempt in range(_ASYNC_MAX_ATTEMPTS):
+        response = await client.post(url, json=payload, timeout=timeout)
+        if response.status_code != 429 or attempt == _ASYNC_MAX_ATTEMPTS - 1:
+            break
+        retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+        logger.warning("Telegram rate limit hit, retrying in %ss", retry_after)
+        await asyncio.sleep(retry_after)
+
+    try:
+        response.raise_for_status()
+    except Exception as exc:
+        logger.error("Failed to send Telegram message: %s", exc, exc_info=True)
+        raise
+
+
+def send_telegram_messages(messages: Iterable[str], **kwargs) -> None:
+    """Send several messages concurrently over one shared client.
+
+    Runs its own event loop, so it can be called from any non-async thread (e.g. an
+    alert worker). Keyword arguments are passed to `send_telegram_message_async`.
+    Delivery order is not guaranteed; the first failure is re-raised once every send
+    has finished.
+    """
+    asyncio.run(_send_batch(list(messages), kwargs))
+
+
+async def _send_batch(messages: list[str], kwargs: dict) -> None:
+    """Gather one send per message, sharing a client when httpx is available."""
+    if HTTPX_AVAILABLE:
+        async with _async_client() as client:
+            results = await asyncio.gather(*(send_telegram_message_async(m, client=client, **kwargs) for m in messages), return_exceptions=True)
+    else:
+        results = await asyncio.gather(*(send_telegram_message_async(m, **kwargs) for m in messages), return_exceptions=True)
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise errors[0]
+
+
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     """Parse CLI arguments for the notifier."""
     parser = argparse.ArgumentParser(description="Send a Telegram alert message.")
     parser.add_argument("message", nargs="?", help="Message text to send. If omitted, reads from STDIN.")
     parser.add_argument("--token", help="Override Telegram bot token.")
-    parser.add_argument("--chat-id", dest="chat_id", help="Override Telegram chat id.")
-    parser.add_argument("--parse-mode", default="Markdown", help="Telegram parse mode, defaults to Markdown.")
+    parser.add_argument("--chat-id", dest="chat_id", help="Override Telegram chat id (comma-separated for several chats).")
+    parser.add_argument("--parse-mode", choices=["HTML", "MarkdownV2", "Markdown"], help="Telegram parse mode, defaults to plain text.")
     parser.add_argument("--timeout", type=int, default=10, help="HTTP request timeout in seconds.")
     return parser.parse_args(argv)
 
@@ -101,12 +334,15 @@ def message_from_args(args: argparse.Namespace) -> str:
 def main(argv: Optional[list[str]] = None) -> None:
     """Entry point for the CLI interface."""
     args = parse_args(argv)
-    message = "测试消息"
+    message = message_from_args(args)
+    # Resolve once up front: fails before any network work, and the explicit values
+    # below skip the env/config lookups inside send_telegram_message
+    token, chat_id = resolve_credentials(args.token, args.chat_id)
 
     send_telegram_message(
         message,
-        token=args.token,
-        chat_id=args.chat_id,
+        token=token,
+        chat_id=chat_id,
         parse_mode=args.parse_mode,
         timeout=args.timeout,
     )
@@ -0,0 +1,72 @@
+"""
+Parity of the v2 monitor's incremental indicators with the pandas_ta baseline
+v2 监控增量指标与 pandas_ta 基线计算结果的一致性检查
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import market_signal_monitor_v2 as monitor
+
+ta = pytest.importorskip("pandas_ta")
+
+# Columns the scorers read that pandas_ta computes the same way as the streaming state
+PARITY_COLUMNS = ['BB_lower', 'BB_middle', 'BB_upper', 'Volume_MA',
+                  'EMA_20', 'EMA_50', 'EMA_200', 'MACD', 'MACD_hist', 'MACD_signal']
+
+
+def weekly_candles(n: int = 200, seed: int = 7) -> pd.DataFrame:
+    """Fixed random-walk weekly OHLCV candles, shaped like get_price_data's output"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.06, n)))
+    spread = rng.uniform(0.01, 0.08, n)
+    return pd.DataFrame({
+        'o': close * (1 + rng.normal(0, 0.02, n)),
+        'h': close * (1 + spread),
+        'l': close * (1 - spread),
+        'c': close,
+        'v': rng.uniform(1e4, 5e4, n),
+    }, index=pd.date_range('2021-01-04', periods=n, freq='W-MON', name='t'))
+
+
+def pandas_ta_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """The indicator columns as the original pandas_ta based calculate_indicators built them"""
+    out = pd.DataFrame(index=df.index)
+    out['EMA_20'] = ta.ema(df['c'], length=20)
+    out['EMA_50'] = ta.ema(df['c'], length=50)
+    out['EMA_200'] = ta.ema(df['c'], length=200)
+    macd = ta.macd(df['c'], fast=12, slow=26, signal=9)
+    out['MACD'], out['MACD_hist'], out['MACD_signal'] = macd.iloc[:, 0], macd.iloc[:, 1], macd.iloc[:, 2]
+    bbands = ta.bbands(df['c'], length=20, std=2)
+    out['BB_lower'], out['BB_middle'], out['BB_upper'] = bbands.iloc[:, 0], bbands.iloc[:, 1], bbands.iloc[:, 2]
+    out['Volume_MA'] = df['v'].rolling(window=20).mean()
+    return out
+
+
+def assert_parity(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    window = actual.index[-monitor._SCORE_WINDOW:]
+    pd.testing.assert_frame_equal(actual.loc[window, PARITY_COLUMNS], expected.loc[window, PARITY_COLUMNS],
+                                  check_exact=False, rtol=1e-9, check_freq=False)
+
+
+def test_cold_replay_matches_pandas_ta(tmp_path):
+    df = weekly_candles()
+    actual = monitor.calculate_indicators_streaming(df, str(tmp_path / 'state.pkl'))
+    assert_parity(actual, pandas_ta_indicators(df))
+
+
+def test_incremental_update_matches_pandas_ta(tmp_path):
+    df = weekly_candles()
+    state_path = str(tmp_path / 'state.pkl')
+    monitor.calculate_indicators_streaming(df.iloc[:-5], state_path)
+    actual = monitor.calculate_indicators_streaming(df, state_path)
+    assert_parity(actual, pandas_ta_indicators(df))
+
+
+def test_kernel_matches_pandas_ta():
+    df = weekly_candles()
+    actual = monitor.calculate_indicators(df.copy())
+    expected = pandas_ta_indicators(df)
+    pd.testing.assert_frame_equal(actual[PARITY_COLUMNS], expected[PARITY_COLUMNS],
+                                  check_exact=False, rtol=1e-9, check_freq=False)